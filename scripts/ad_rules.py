@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ad rules engine - per-format limits, counts and cross-field rules from scripts/rules/*.json compiled into a validation plan
+"""
+import os
+import json
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from duplicates import DEFAULT_THRESHOLD, duplicate_pairs, normalize
+from editorial import CAPS_MIN, PolicyScanner, PolicyViolation, compile_scanner
+from shortening import shortening_candidates, suggest_shortening
+from text_width import text_width
+
+RULES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules')
+DEFAULT_LIMIT = 30
+DEFAULT_MAX_COUNT = 999
+
+
+class TextCheck:
+    """Validation result of single text - length (valid) and editorial policy (compliant)"""
+    __slots__ = ('text', 'length', 'limit', 'overflow', 'suggestion', 'violations')
+
+    def __init__(self, text: str, length: int, limit: int, suggestion: Optional[str] = None,
+                 violations: Tuple[PolicyViolation, ...] = ()):
+        self.text = text
+        self.length = length
+        self.limit = limit
+        self.overflow = max(0, length - limit)
+        self.suggestion = suggestion
+        self.violations = violations
+
+    @property
+    def valid(self) -> bool:
+        return self.overflow == 0
+
+    @property
+    def compliant(self) -> bool:
+        return not self.violations
+
+    @property
+    def status(self) -> str:
+        return '✅' if self.valid and self.compliant else '❌'
+
+    @property
+    def corrected(self) -> str:
+        return self.text if self.valid else self.suggestion
+
+    def to_dict(self) -> Dict:
+        result = {
+            'text': self.text,
+            'length': self.length,
+            'limit': self.limit,
+            'valid': self.valid,
+            'status': self.status
+        }
+        if not self.valid:
+            result['overflow'] = self.overflow
+            result['suggestion'] = self.suggestion
+            result['alternatives'] = [text for text in shortening_candidates(self.text, self.limit)
+                                      if text != self.suggestion]
+        if self.violations:
+            result['policy'] = [violation.to_dict() for violation in self.violations]
+        return result
+
+
+class CountCheck:
+    """Validation result of element count"""
+    __slots__ = ('type', 'count', 'min', 'max', 'error')
+
+    def __init__(self, element_type: str, count: int, min_count: int, max_count: int):
+        self.type = element_type
+        self.count = count
+        self.min = min_count
+        self.max = max_count
+        if count < min_count:
+            self.error = f"Too few elements (minimum: {min_count})"
+        elif count > max_count:
+            self.error = f"Too many elements (maximum: {max_count})"
+        else:
+            self.error = None
+
+    @property
+    def valid(self) -> bool:
+        return self.error is None
+
+    @property
+    def status(self) -> str:
+        return '✅' if self.valid else '❌'
+
+    @property
+    def required(self) -> str:
+        return f"exactly {self.min}" if self.min == self.max else f"{self.min}-{self.max}"
+
+    def to_dict(self) -> Dict:
+        result = {
+            'type': self.type,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'valid': self.valid,
+            'status': self.status
+        }
+        if not self.valid:
+            result['error'] = self.error
+        return result
+
+
+class FieldRule:
+    """Compiled limit and count requirement of one text field"""
+    __slots__ = ('field', 'text_type', 'limit', 'min', 'max', 'label', 'section', 'item')
+
+    def __init__(self, spec: Dict):
+        self.field = spec['field']
+        self.text_type = spec.get('type', self.field.rstrip('s'))
+        self.limit = spec.get('limit', DEFAULT_LIMIT)
+        self.min = spec.get('min', 0)
+        self.max = spec.get('max', DEFAULT_MAX_COUNT)
+        self.label = spec.get('label', self.field.replace('_', ' ').title())
+        self.section = spec.get('section', self.label.upper())
+        self.item = spec.get('item', '{i}. ')
+
+
+class RuleCheck:
+    """Result of a cross-field rule"""
+    __slots__ = ('rule', 'matches')
+
+    def __init__(self, rule, matches: List[str]):
+        self.rule = rule
+        self.matches = matches
+
+    @property
+    def valid(self) -> bool:
+        return len(self.matches) >= self.rule.min
+
+    @property
+    def status(self) -> str:
+        return '✅' if self.valid else '❌'
+
+    def to_dict(self) -> Dict:
+        return {
+            'requirement': self.rule.requirement,
+            'found': len(self.matches),
+            'valid': self.valid,
+            'status': self.status,
+            f'short_{self.rule.field}': self.matches
+        }
+
+
+class MinShortRule:
+    """At least `min` texts of a field no longer than `max_length` (e.g. PMAX mobile headline)"""
+    __slots__ = ('name', 'field', 'max_length', 'min', 'requirement', 'error', 'report_error', 'summary', 'tag')
+
+    def __init__(self, spec: Dict):
+        self.name = spec['name']
+        self.field = spec['field']
+        self.max_length = spec['max_length']
+        self.min = spec.get('min', 1)
+        self.requirement = spec.get('requirement', f"At least {self.min} {self.field} ≤{self.max_length} chars")
+        self.error = spec.get('error', self.requirement)
+        self.report_error = spec.get('report_error', [f"❌ {self.error}"])
+        self.summary = spec.get('summary', self.requirement)
+        self.tag = spec.get('tag', '')
+
+    def check(self, checks: List[TextCheck]) -> RuleCheck:
+        return RuleCheck(self, [check.text for check in checks if check.length <= self.max_length])
+
+
+# Cross-field rule kinds available to spec files
+RULE_KINDS = {
+    'min_short': MinShortRule,
+}
+
+
+class DuplicateCheck:
+    """Two texts of a field that are exact or near-duplicates - a warning, lowers ad strength"""
+    __slots__ = ('field', 'first', 'second', 'texts', 'similarity')
+
+    def __init__(self, field: str, first: int, second: int, texts: List[str], similarity: float):
+        self.field = field
+        self.first = first
+        self.second = second
+        self.texts = texts
+        self.similarity = similarity
+
+    @property
+    def exact(self) -> bool:
+        return normalize(self.texts[0]) == normalize(self.texts[1])
+
+    def to_dict(self) -> Dict:
+        return {
+            'field': self.field,
+            'items': [self.first, self.second],
+            'texts': self.texts,
+            'kind': 'exact' if self.exact else 'near',
+            'similarity': self.similarity
+        }
+
+
+class DuplicateRule:
+    """Fields whose texts are compared for duplicates, with the near-duplicate threshold"""
+    __slots__ = ('fields', 'threshold')
+
+    def __init__(self, spec: Dict):
+        self.fields = tuple(spec['fields'])
+        self.threshold = spec.get('threshold', DEFAULT_THRESHOLD)
+
+    def check(self, texts: Dict[str, List[TextCheck]]) -> List[DuplicateCheck]:
+        found = []
+        for field in self.fields:
+            values = [check.text for check in texts.get(field, [])]
+            for i, j, similarity in duplicate_pairs(values, self.threshold):
+                found.append(DuplicateCheck(field, i + 1, j + 1, [values[i], values[j]], similarity))
+        return found
+
+
+class AdValidation:
+    """Result of one validation pass over an ad - consumed by the report and the output files"""
+    __slots__ = ('plan', 'ad_data', 'texts', 'counts', 'rules', 'duplicates', '_report')
+
+    def __init__(self, plan: 'RulePlan', ad_data: Dict, texts: Dict[str, List[TextCheck]],
+                 counts: Dict[str, CountCheck], rules: Dict[str, RuleCheck],
+                 duplicates: Optional[List[DuplicateCheck]] = None):
+        self.plan = plan
+        self.ad_data = ad_data
+        self.texts = texts
+        self.counts = counts
+        self.rules = rules
+        self.duplicates = duplicates or []
+        self._report = None
+
+    @property
+    def error_count(self) -> int:
+        return sum(1 for checks in self.texts.values() for check in checks if not check.valid)
+
+    @property
+    def count_errors(self) -> List[str]:
+        errors = [f"{rule.label}: {self.counts[rule.field].error}"
+                  for rule in self.plan.fields if not self.counts[rule.field].valid]
+        return errors + [check.rule.error for check in self.rules.values() if not check.valid]
+
+    @property
+    def policy_count(self) -> int:
+        return sum(len(check.violations) for checks in self.texts.values() for check in checks)
+
+    @property
+    def all_valid(self) -> bool:
+        return self.error_count == 0 and not self.count_errors and self.policy_count == 0
+
+    def report(self) -> str:
+        """Report text, rendered on first use"""
+        if self._report is None:
+            self._report = self.plan.render_report(self)
+        return self._report
+
+    def validated_data(self) -> Dict:
+        """Detailed results written to *_validated.json"""
+        output = self.plan.output
+        data = {key: self.ad_data.get(key, '') for key in output['meta']}
+        if output['echo_texts']:
+            for field in self.texts:
+                data[field] = self.ad_data.get(field, [])
+            for key in output['extra']:
+                data[key] = self.ad_data.get(key, '')
+        for field, checks in self.texts.items():
+            data[f'{field}_validation'] = [check.to_dict() for check in checks]
+        for field, check in self.counts.items():
+            data[f'{field}_count'] = check.to_dict()
+        for name, check in self.rules.items():
+            data[name] = check.to_dict()
+        if self.plan.duplicates:
+            data['duplicates'] = [check.to_dict() for check in self.duplicates]
+        data['all_valid'] = self.all_valid
+        data['error_count'] = self.error_count
+        if self.plan.scanners:
+            data['policy_count'] = self.policy_count
+        data['count_errors'] = self.count_errors
+        return data
+
+    def corrected_data(self) -> Dict:
+        """Ad with texts over the limit replaced by suggestions (*_corrected.json)"""
+        output = self.plan.output
+        data = {key: self.ad_data.get(key, '') for key in output['meta']}
+        for field, checks in self.texts.items():
+            data[field] = [check.corrected for check in checks]
+        for key in output['extra']:
+            data[key] = self.ad_data.get(key, '')
+        return data
+
+
+class RulePlan:
+    """Rule spec compiled once: field rules in report order, limits per text type and cross-field rules"""
+
+    def __init__(self, spec: Dict):
+        self.format = spec.get('format', '')
+        self.title = spec.get('title', f"📊 {self.format.upper()} VALIDATION REPORT")
+        self.fields = tuple(FieldRule(field) for field in spec['fields'])
+        self.by_type = {rule.text_type: rule for rule in self.fields}
+        self.by_field = {rule.field: rule for rule in self.fields}
+        self.rules = []
+        for rule in spec.get('rules', []):
+            kind = rule.get('kind')
+            if kind not in RULE_KINDS:
+                raise ValueError(f"Unknown rule kind '{kind}' in {self.format or 'rule'} spec")
+            self.rules.append(RULE_KINDS[kind](rule))
+        self.duplicates = DuplicateRule(spec['duplicates']) if 'duplicates' in spec else None
+        # Editorial rules of every listed field (common "rules" + the field's own) as one scanner each
+        editorial = spec.get('editorial', {})
+        unknown = [field for field in editorial.get('fields', {}) if field not in self.by_field]
+        if unknown:
+            raise ValueError(f"Unknown editorial field(s) {unknown} in {self.format or 'rule'} spec")
+        caps_min = editorial.get('caps_min', CAPS_MIN)
+        acronyms = tuple(editorial.get('acronyms', []))
+        self.scanners = {field: compile_scanner(tuple(editorial.get('rules', [])) + tuple(extra), caps_min, acronyms)
+                         for field, extra in editorial.get('fields', {}).items()}
+        # Tags appended to report lines of texts that satisfy a rule (e.g. 📱 for mobile headlines)
+        self.tags = {rule.field: rule for rule in self.rules if rule.tag}
+        output = spec.get('output', {})
+        self.output = {
+            'meta': output.get('meta', ['campaign_name', 'product', 'url']),
+            'echo_texts': output.get('echo_texts', False),
+            'extra': output.get('extra', [])
+        }
+
+    @property
+    def required_fields(self) -> List[str]:
+        return [rule.field for rule in self.fields]
+
+    @property
+    def limits(self) -> Dict[str, int]:
+        return {rule.text_type: rule.limit for rule in self.fields}
+
+    @property
+    def count_requirements(self) -> Dict[str, Dict[str, int]]:
+        return {rule.field: {'min': rule.min, 'max': rule.max} for rule in self.fields}
+
+    def check_text(self, text: str, text_type: str,
+                   shorten: Callable[[str, int], str] = suggest_shortening) -> TextCheck:
+        rule = self.by_type.get(text_type)
+        limit = rule.limit if rule else DEFAULT_LIMIT
+        length = text_width(text)
+        scanner = self.scanner(text_type)
+        return TextCheck(text, length, limit, shorten(text, limit) if length > limit else None,
+                         scanner.scan(text) if scanner else ())
+
+    def scanner(self, text_type: str) -> Optional[PolicyScanner]:
+        """Editorial scanner of a text type, None when its field is not checked"""
+        rule = self.by_type.get(text_type)
+        return self.scanners.get(rule.field) if rule else None
+
+    def check_count(self, element_type: str, count: int) -> CountCheck:
+        rule = self.by_field.get(element_type)
+        if rule is None:
+            return CountCheck(element_type, count, 0, DEFAULT_MAX_COUNT)
+        return CountCheck(element_type, count, rule.min, rule.max)
+
+    def validate(self, ad_data: Dict, shorten: Callable[[str, int], str] = suggest_shortening) -> AdValidation:
+        """Validates all texts, counts and cross-field rules of an ad once"""
+        texts = {}
+        counts = {}
+        for rule in self.fields:
+            values = ad_data.get(rule.field, [])
+            limit = rule.limit
+            scanner = self.scanners.get(rule.field)
+            checks = []
+            for text in values:
+                length = text_width(text)
+                checks.append(TextCheck(text, length, limit, shorten(text, limit) if length > limit else None,
+                                        scanner.scan(text) if scanner else ()))
+            texts[rule.field] = checks
+            counts[rule.field] = CountCheck(rule.field, len(values), rule.min, rule.max)
+        rules = {rule.name: rule.check(texts[rule.field]) for rule in self.rules}
+        duplicates = self.duplicates.check(texts) if self.duplicates else None
+        return AdValidation(self, ad_data, texts, counts, rules, duplicates)
+
+    def render_report(self, validation: AdValidation) -> str:
+        """Renders report text from validation results"""
+        ad_data = validation.ad_data
+        present = [rule for rule in self.fields if rule.field in ad_data]
+        report = []
+        report.append("=" * 60)
+        report.append(self.title)
+        report.append("=" * 60)
+
+        # Element count and cross-field errors
+        for rule in present:
+            if not validation.counts[rule.field].valid:
+                report.append(f"\n❌ ERROR: {validation.counts[rule.field].error}")
+        for check in validation.rules.values():
+            if check.rule.field in ad_data and not check.valid:
+                report.append("\n" + "\n".join(check.rule.report_error))
+
+        # Texts of every field
+        for rule in present:
+            checks = validation.texts[rule.field]
+            tag_rule = self.tags.get(rule.field)
+            indent = " " * len(rule.item.format(i=1))
+            report.append(f"\n{rule.section} ({len(checks)} items, max {rule.limit} characters):")
+            report.append("-" * 40)
+            for i, result in enumerate(checks, 1):
+                tag = tag_rule.tag if tag_rule and result.length <= tag_rule.max_length else ""
+                report.append(f"{rule.item.format(i=i)}{result.status} [{result.length:2}/{result.limit}] "
+                              f"\"{result.text}\"{tag}")
+                if not result.valid:
+                    report.append(f"{indent}💡 Suggestion: \"{result.suggestion}\"")
+                for violation in result.violations:
+                    report.append(f"{indent}🚫 {violation.message} ({violation.start + 1}-{violation.end}): "
+                                  f"\"{violation.match}\"")
+
+        # Duplicates - warnings only, Google accepts the ad but lowers its ad strength
+        if validation.duplicates:
+            report.append("\n🔁 DUPLICATES (lower ad strength):")
+            report.append("-" * 40)
+            for check in validation.duplicates:
+                kind = "exact" if check.exact else f"{check.similarity:.0%} similar"
+                report.append(f"⚠️ {self.by_field[check.field].label} {check.first} / {check.second} ({kind}): "
+                              f"\"{check.texts[0]}\" / \"{check.texts[1]}\"")
+
+        # Summary
+        report.append("\n" + "=" * 60)
+        report.append("📈 SUMMARY:")
+        for rule in present:
+            check = validation.counts[rule.field]
+            report.append(f"{check.status} Number of {rule.field.replace('_', ' ')}: {check.count} "
+                          f"(required: {check.required})")
+        for check in validation.rules.values():
+            if check.rule.field in ad_data:
+                report.append(f"{check.status} {check.rule.summary}: {len(check.matches)} found")
+        for field, checks in validation.texts.items():
+            valid = sum(1 for check in checks if check.valid)
+            report.append(f"✅ Valid {field.replace('_', ' ')} (length): {valid}/{len(checks)}")
+        if self.scanners:
+            policy_count = validation.policy_count
+            report.append(f"{'✅' if policy_count == 0 else '❌'} Editorial policy violations: {policy_count}")
+        if validation.duplicates:
+            report.append(f"⚠️ Duplicate pairs: {len(validation.duplicates)}")
+
+        return "\n".join(report)
+
+
+def spec_path(spec: str) -> str:
+    """Rule spec name (rsa, pmax) or path to a JSON spec file"""
+    if spec.endswith('.json') or os.sep in spec:
+        return spec
+    return os.path.join(RULES_DIR, f'{spec}.json')
+
+
+@lru_cache(maxsize=None)
+def load_plan(spec: str) -> RulePlan:
+    """Loads and compiles a rule spec once per process"""
+    with open(spec_path(spec), 'r', encoding='utf-8') as f:
+        return RulePlan(json.load(f))
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crawl benchmark - measures fetch_website.py throughput against a local fixture web server
+"""
+import os
+import sys
+import json
+import time
+import glob
+import random
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List, Optional
+
+DEFAULT_PAGES = 50
+DEFAULT_PAGE_KB = 40
+DEFAULT_LATENCY_MS = 50
+DEFAULT_CONCURRENCY = [1, 4, 8]
+DEFAULT_MODES = ["prune", "bm25"]
+DEFAULT_TOLERANCE = 0.2         # allowed pages/sec drop against baseline
+BENCH_KEYWORD = "running shoes"
+STARTUP_BUDGET_MS = 500         # wall time of a no-crawl fetch_website.py run, interpreter start included
+STARTUP_RUNS = 5
+RSS_SAMPLE_S = 0.1              # process tree RSS sampling interval
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs fetch_website.main() with cache and hash ledger in a temporary directory,
+# then reports whether crawl4ai was imported on the way
+STARTUP_HARNESS = """
+import sys, json, asyncio
+sys.path.insert(0, {scripts!r})
+import fetch_website
+fetch_website.CACHE_DIR, fetch_website.HASH_LEDGER = {cache!r}, {ledger!r}
+sys.argv = ["fetch_website.py"] + {argv!r}
+try:
+    asyncio.run(fetch_website.main())
+except SystemExit:
+    pass
+sys.stderr.write(json.dumps({{"crawl4ai_imported": "crawl4ai" in sys.modules}}) + "\\n")
+"""
+
+WORDS = ("running shoes trail road cushioning grip lightweight waterproof size delivery return warranty "
+         "price sale women men kids sport outdoor comfort breathable sole upper fit store").split()
+
+
+def synthetic_page(index: int, size_kb: int) -> str:
+    """Deterministic e-commerce-like page with navigation, paragraphs, lists and footer"""
+    rng = random.Random(index)
+    nav = "".join(f'<li><a href="/c/{i}">Category {i}</a></li>' for i in range(15))
+    parts = [f"<html><head><title>Product {index}</title></head><body><nav><ul>{nav}</ul></nav>",
+             f"<main><h1>Product {index}</h1>"]
+    size = 0
+    while size < size_kb * 1024:
+        text = " ".join(rng.choice(WORDS) for _ in range(60))
+        block = f"<h2>{text[:30]}</h2><p>{text}.</p><ul>" + "".join(
+            f"<li>{rng.choice(WORDS)} {rng.choice(WORDS)}</li>" for _ in range(5)) + "</ul>"
+        parts.append(block)
+        size += len(block)
+    parts.append("</main><footer>Cookies policy. All rights reserved.</footer></body></html>")
+    return "".join(parts)
+
+
+def load_corpus(corpus: str, pages: int, size_kb: int) -> List[str]:
+    """Saved *.html pages from corpus directory, or synthetic pages"""
+    if corpus:
+        paths = sorted(glob.glob(os.path.join(corpus, "*.html")))
+        if not paths:
+            raise SystemExit(f"❌ No *.html files in {corpus}")
+        html = []
+        for path in paths[:pages]:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                html.append(f.read())
+        return html
+    return [synthetic_page(i, size_kb) for i in range(pages)]
+
+
+async def start_fixture_server(pages: List[str], latency_ms: int, port: int = 0):
+    """Serves pages as /page/<n> with artificial latency; returns (runner, base URL)"""
+    from aiohttp import web
+
+    async def page(request):
+        index = int(request.match_info["index"])
+        if index >= len(pages):
+            raise web.HTTPNotFound()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        return web.Response(text=pages[index], content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/page/{index}", page)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _children(pid: int) -> List[int]:
+    children = []
+    for tid in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{tid}/children", "r") as f:
+            children.extend(int(child) for child in f.read().split())
+    return children
+
+
+def tree_rss_mb(pid: int) -> Optional[float]:
+    """Current RSS of pid and all its descendants (Playwright driver, Chromium), in MB;
+    None without /proc/<pid>/task/<tid>/children (non-Linux)"""
+    try:
+        _children(pid)
+    except OSError:
+        return None
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm", "r") as f:
+                total += int(f.read().split()[1])  # resident pages
+            pending.extend(_children(current))
+        except OSError:
+            continue  # exited while sampling
+    return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def self_peak_rss_mb() -> float:
+    """Peak RSS of this process only, in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)  # bytes on macOS, KB on Linux
+
+
+class RssSampler:
+    """Peak summed RSS of this process and its descendants, sampled while a benchmark runs.
+
+    The browser runs in processes this one never waits for, so getrusage() does not see it;
+    without /proc (macOS) only this process is measured and scope says so.
+    """
+
+    def __init__(self):
+        self.peak = 0.0
+        self.scope = "process tree" if tree_rss_mb(os.getpid()) is not None else "process"
+        self._task = None
+
+    def sample(self):
+        current = tree_rss_mb(os.getpid()) if self.scope == "process tree" else self_peak_rss_mb()
+        self.peak = max(self.peak, current or 0.0)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(RSS_SAMPLE_S)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    def stop(self) -> float:
+        self._task.cancel()
+        self.sample()
+        return self.peak
+
+
+async def run_one(base_url: str, pages: int, mode: str, concurrency: int, fetcher: str) -> Dict:
+    """One benchmark configuration - runs in its own process so peak RSS is not shared"""
+    from fetch_website import CrawlSession, crawl_targets
+    from crawl_scheduler import HostScheduler
+
+    scheduler = HostScheduler(per_host=concurrency, respect_robots=False)
+    session = CrawlSession(fetcher=fetcher, scheduler=scheduler, retries=0)
+    target = [(mode, BENCH_KEYWORD if mode == "bm25" else None)]
+    latencies, failed = [], 0
+    rss = RssSampler()
+    rss.start()
+
+    async with session:
+        launch = None
+        if fetcher == "browser":
+            started = time.perf_counter()
+            await session.crawler()
+            launch = time.perf_counter() - started
+
+        urls = iter(f"{base_url}/page/{i}" for i in range(pages))
+
+        async def worker():
+            nonlocal failed
+            for url in urls:
+                started = time.perf_counter()
+                (result, _), = await crawl_targets(session, url, target)
+                latencies.append(time.perf_counter() - started)
+                failed += not result["success"]
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        peak_rss = rss.stop()  # before the browser is closed
+
+    return {
+        "mode": mode,
+        "fetcher": fetcher,
+        "concurrency": concurrency,
+        "pages": pages,
+        "failed": failed,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "browser_launch_s": round(launch, 3) if launch is not None else None,
+        "peak_rss_mb": round(peak_rss, 1),
+        "rss_scope": rss.scope,
+    }
+
+
+async def run_suite(args) -> List[Dict]:
+    pages = load_corpus(args.corpus, args.pages, args.page_kb)
+    runner, base_url = await start_fixture_server(pages, args.latency_ms)
+    print(f"Serving {len(pages)} fixture pages at {base_url} ({args.latency_ms} ms latency)")
+
+    results = []
+    try:
+        for fetcher in args.fetcher:
+            for mode in args.modes:
+                for concurrency in args.concurrency:
+                    # Child process keeps peak RSS and browser state of each configuration separate
+                    process = await asyncio.create_subprocess_exec(
+                        sys.executable, os.path.abspath(__file__), "_run", base_url, str(len(pages)),
+                        mode, str(concurrency), fetcher,
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                    )
+                    stdout, stderr = await process.communicate()
+                    lines = stdout.decode("utf-8", errors="replace").strip().splitlines()
+                    if process.returncode != 0 or not lines:
+                        # Exception line of the traceback, not the decorated Playwright banner
+                        error = [line for line in stderr.decode("utf-8", errors="replace").splitlines()
+                                 if line[:1].isalpha() and ("Error" in line or "Exception" in line)]
+                        print(f"❌ {fetcher}/{mode}/c{concurrency} failed: {error[-1] if error else 'no output'}")
+                        continue
+                    result = json.loads(lines[-1])
+                    results.append(result)
+                    print_row(result)
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def print_row(result: Dict):
+    launch = f"{result['browser_launch_s']:.2f}s" if result["browser_launch_s"] is not None else "-"
+    print(f"  {result['fetcher']:8} {result['mode']:6} c={result['concurrency']:<3} "
+          f"{result['pages_per_sec']:8.2f} pages/s  p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+          f"RSS {result['peak_rss_mb']:7.1f} MB  launch {launch}  failed {result['failed']}")
+
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Returns configurations whose throughput dropped more than tolerance below baseline"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["fetcher"], r["mode"], r["concurrency"]): r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get((result["fetcher"], result["mode"], result["concurrency"]))
+        if before and result["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            regressions.append(f"{result['fetcher']}/{result['mode']}/c{result['concurrency']}: "
+                               f"{before['pages_per_sec']} -> {result['pages_per_sec']} pages/s")
+    return regressions
+
+
+def check_startup(budget_ms: float = STARTUP_BUDGET_MS, runs: int = STARTUP_RUNS) -> bool:
+    """Times no-crawl paths of fetch_website.py; False if any exceeds budget or imports crawl4ai"""
+    from crawl_cache import CrawlCache
+
+    url = "https://startup-check.invalid/page"
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "cache")
+        result = {"url": url, "filter": "prune", "query": None, "markdown": "cached page", "success": True}
+        CrawlCache(cache_dir).put(url, "prune", None, result)
+        paths = {
+            "help": ["--help"],
+            "output path": [url, "keyword", "--output-path"],
+            "cache hit": [url, "--ignore-robots", "--store", os.path.join(tmp, "store")],
+        }
+
+        ok = True
+        print(f"Startup budget: {budget_ms:.0f} ms (median of {runs} runs)")
+        for name, argv in paths.items():
+            code = STARTUP_HARNESS.format(scripts=SCRIPTS_DIR, cache=cache_dir,
+                                          ledger=os.path.join(tmp, "hashes.json"), argv=argv)
+            times, imported = [], False
+            for _ in range(runs):
+                started = time.perf_counter()
+                process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+                times.append((time.perf_counter() - started) * 1000)
+                lines = process.stderr.strip().splitlines()
+                imported = imported or process.returncode != 0 or not lines or json.loads(lines[-1])["crawl4ai_imported"]
+            median = percentile(times, 0.5)
+            passed = median <= budget_ms and not imported
+            ok = ok and passed
+            note = " - crawl4ai imported" if imported else ""
+            print(f"  {'✅' if passed else '❌'} {name:12} {median:7.1f} ms{note}")
+        return ok
+
+
+def main():
+    if sys.argv[1:2] == ["_run"]:
+        base_url, pages, mode, concurrency, fetcher = sys.argv[2:7]
+        # Crawl logs go to stderr, the result line to stdout
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = asyncio.run(run_one(base_url, int(pages), mode, int(concurrency), fetcher))
+        stdout.write(json.dumps(result) + "\n")
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark fetch_website.py against a local fixture server (no network needed).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python3 %(prog)s                                        # HTTP fetcher, prune + bm25, concurrency 1/4/8
+  python3 %(prog)s --fetcher http browser --pages 20      # Include browser launch overhead
+  python3 %(prog)s --corpus saved_pages/ --latency-ms 200 # Saved HTML pages instead of synthetic ones
+  python3 %(prog)s --output bench.json                    # Save results as baseline
+  python3 %(prog)s --baseline bench.json                  # Exit 1 on throughput regression
+  python3 %(prog)s --startup                              # Exit 1 if --help / cache hit start slowly
+        """
+    )
+    parser.add_argument("--corpus", type=str, metavar="DIR", help="Directory with saved *.html pages (default: synthetic pages)")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES, help=f"Pages per run (default: {DEFAULT_PAGES})")
+    parser.add_argument("--page-kb", type=int, default=DEFAULT_PAGE_KB,
+                        help=f"Size of synthetic pages in KB (default: {DEFAULT_PAGE_KB})")
+    parser.add_argument("--latency-ms", type=int, default=DEFAULT_LATENCY_MS,
+                        help=f"Server latency per page in ms (default: {DEFAULT_LATENCY_MS})")
+    parser.add_argument("--modes", type=str, nargs="+", choices=["prune", "bm25"], default=DEFAULT_MODES)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY,
+                        help="Concurrency levels (default: 1 4 8)")
+    parser.add_argument("--fetcher", type=str, nargs="+", choices=["http", "browser"], default=["http"],
+                        help="Fetchers to benchmark (default: http; browser needs installed Playwright browsers)")
+    parser.add_argument("--output", type=str, metavar="FILE", help="Save results as JSON (usable as --baseline)")
+    parser.add_argument("--baseline", type=str, metavar="FILE", help="Compare pages/sec with saved results")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed pages/sec drop against baseline (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--startup", action="store_true",
+                        help="Only check startup time of no-crawl paths (--help, --output-path, cache hit)")
+    parser.add_argument("--startup-budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help=f"Startup budget per path in ms (default: {STARTUP_BUDGET_MS})")
+    args = parser.parse_args()
+
+    if args.startup:
+        sys.exit(0 if check_startup(args.startup_budget_ms) else 1)
+
+    results = asyncio.run(run_suite(args))
+    if not results:
+        print("❌ No benchmark run succeeded")
+        sys.exit(1)
+
+    if args.output:
+        settings = {"pages": args.pages, "page_kb": args.page_kb, "latency_ms": args.latency_ms,
+                    "corpus": args.corpus}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=4)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("❌ Throughput regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("✅ No throughput regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
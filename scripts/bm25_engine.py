@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vectorized BM25 engine - scores page chunks against many keywords in one matrix operation
+"""
+import re
+from typing import Dict, List
+
+import numpy as np
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Minimum chunk score to keep a chunk in keyword fit markdown
+DEFAULT_THRESHOLD = 1.0
+# Queries scored per matrix operation (bounds temporary matrix size)
+QUERY_BLOCK = 2048
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+you your we our i me my not no
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords and single characters"""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def chunk_markdown(markdown: str) -> List[str]:
+    """Splits markdown into passages - one per non-empty line (paragraph, heading, list item)"""
+    return [line.strip() for line in markdown.splitlines() if line.strip()]
+
+
+class BM25Index:
+    """BM25 weights of page chunks as a dense (chunks x terms) matrix.
+
+    Weights are precomputed once, so scoring a query is only a column gather
+    and a sum - all queries of a block are scored with one np.add.reduceat.
+    """
+
+    def __init__(self, chunks: List[str], k1: float = K1, b: float = B):
+        self.chunks = chunks
+        self.vocab: Dict[str, int] = {}
+
+        rows, cols = [], []
+        lengths = np.zeros(len(chunks), dtype=np.float32)
+        for row, chunk in enumerate(chunks):
+            tokens = tokenize(chunk)
+            lengths[row] = len(tokens)
+            for token in tokens:
+                rows.append(row)
+                cols.append(self.vocab.setdefault(token, len(self.vocab)))
+
+        # Last column stays zero - unknown query terms point to it
+        self.unknown = len(self.vocab)
+        tf = np.zeros((len(chunks), self.unknown + 1), dtype=np.float32)
+        np.add.at(tf, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), 1.0)
+
+        n_chunks = max(len(chunks), 1)
+        df = np.count_nonzero(tf, axis=0).astype(np.float32)
+        idf = np.log1p((n_chunks - df + 0.5) / (df + 0.5))
+        idf[self.unknown] = 0.0
+
+        avg_length = float(lengths.mean()) if len(chunks) else 0.0
+        norm = k1 * (1.0 - b + b * lengths / (avg_length or 1.0))
+        self.weights = idf * tf * (k1 + 1.0) / (tf + norm[:, None])
+
+    @classmethod
+    def from_markdown(cls, markdown: str, **kwargs) -> "BM25Index":
+        return cls(chunk_markdown(markdown), **kwargs)
+
+    def _term_ids(self, query: str) -> List[int]:
+        ids = {self.vocab.get(token, self.unknown) for token in tokenize(query)}
+        return sorted(ids) or [self.unknown]
+
+    def score(self, queries: List[str]) -> np.ndarray:
+        """Returns (chunks x queries) matrix of BM25 scores"""
+        scores = np.zeros((len(self.chunks), len(queries)), dtype=np.float32)
+        for start in range(0, len(queries), QUERY_BLOCK):
+            block = queries[start:start + QUERY_BLOCK]
+            ids, offsets = [], []
+            for query in block:
+                offsets.append(len(ids))
+                ids.extend(self._term_ids(query))
+            gathered = self.weights[:, np.array(ids, dtype=np.intp)]
+            scores[:, start:start + len(block)] = np.add.reduceat(gathered, np.array(offsets, dtype=np.intp), axis=1)
+        return scores
+
+    def fit_markdown(self, queries: List[str], threshold: float = DEFAULT_THRESHOLD) -> Dict[str, str]:
+        """Returns keyword -> markdown of chunks scoring at least threshold, in page order"""
+        if not self.chunks:
+            return {query: "" for query in queries}
+
+        keep = self.score(queries) >= max(threshold, np.finfo(np.float32).tiny)
+        return {
+            query: "\n".join(self.chunks[i] for i in np.flatnonzero(keep[:, q]))
+            for q, query in enumerate(queries)
+        }
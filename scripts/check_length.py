@@ -5,6 +5,8 @@ Text length checker - returns character count for each input string.
 """
 import sys
 
+from text_width import text_width
+
 
 def main():
     texts = []
@@ -22,7 +24,7 @@ def main():
         sys.exit(0)
 
     for text in texts:
-        print(f'"{text}" - {len(text)}')
+        print(f'"{text}" - {text_width(text)}')
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Markdown compaction - shrinks crawled markdown to a token budget before it is sent to the LLM
+"""
+import re
+import sys
+import json
+import argparse
+from typing import Dict, List, Optional, Set
+
+DEFAULT_BUDGET = 2000       # tokens
+LIST_ITEMS_KEPT = 8         # items kept from one long list
+TABLE_ROWS_KEPT = 6         # body rows kept from one table
+BOILERPLATE_MAX_WORDS = 40  # longer lines are content even when they mention cookies or privacy
+
+IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+BARE_URL_RE = re.compile(r"<?https?://\S+>?")
+LIST_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+TABLE_ROW_RE = re.compile(r"^\s*\|.*\|\s*$")
+TABLE_RULE_RE = re.compile(r"^\s*\|?\s*:?-{3,}")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Consent banners and legal footers repeated on every page of a site - a cookie word alone is not
+# enough ("Ciasteczka owsiane" on a bakery page), it needs a consent word in the same line
+COOKIE_RE = re.compile(r"\b(?:cookie|cookies|ciasteczk\w*)\b", re.IGNORECASE)
+CONSENT_RE = re.compile(
+    r"\b(?:accept\w*|akceptuj\w*|consent|zgod\w*|zgadzasz|agree|przeglądark\w*|browser|ustawie\w*|settings|"
+    r"rodo|gdpr|pliki cookies?|plików cookies?|(?:this )?(?:site|website) uses|"
+    r"(?:strona|serwis|witryna) (?:używa|wykorzystuje|korzysta))\b",
+    re.IGNORECASE
+)
+LEGAL_RE = re.compile(
+    r"\b(?:privacy policy|polityk\w* prywatno\w*|all rights reserved|wszelkie prawa zastrze\w*)\b",
+    re.IGNORECASE
+)
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken (cl100k_base) when installed, otherwise ~4 characters per token"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def strip_links(line: str) -> str:
+    """Keeps link and image text, drops URLs"""
+    line = IMAGE_RE.sub(lambda m: m.group(1), line)
+    line = LINK_RE.sub(lambda m: m.group(1), line)
+    return BARE_URL_RE.sub("", line)
+
+
+def _normalized(line: str) -> str:
+    return " ".join(WORD_RE.findall(line.lower()))
+
+
+def _terms(keyword: Optional[str]) -> Set[str]:
+    return set(WORD_RE.findall(keyword.lower())) if keyword else set()
+
+
+def clean_lines(markdown: str) -> List[str]:
+    """Strips URLs and drops empty and repeated lines (first occurrence kept)"""
+    seen = set()
+    lines = []
+    for line in markdown.splitlines():
+        line = strip_links(line).rstrip()
+        key = _normalized(line)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    return lines
+
+
+def is_boilerplate(line: str) -> bool:
+    """Short cookie consent banner or legal footer line"""
+    if HEADING_RE.match(line) or len(WORD_RE.findall(line)) > BOILERPLATE_MAX_WORDS:
+        return False
+    return bool(LEGAL_RE.search(line) or (COOKIE_RE.search(line) and CONSENT_RE.search(line)))
+
+
+def drop_boilerplate(lines: List[str], keyword: Optional[str] = None) -> List[str]:
+    """Drops consent and legal boilerplate lines, except those matching the keyword"""
+    terms = _terms(keyword)
+    return [line for line in lines
+            if not is_boilerplate(line) or terms & set(WORD_RE.findall(line.lower()))]
+
+
+def collapse_blocks(lines: List[str], list_items: int = LIST_ITEMS_KEPT, table_rows: int = TABLE_ROWS_KEPT) -> List[str]:
+    """Shortens long lists and tables to their first items with a count of the rest"""
+    result = []
+    i = 0
+    while i < len(lines):
+        if TABLE_ROW_RE.match(lines[i]):
+            end = i
+            while end < len(lines) and TABLE_ROW_RE.match(lines[end]):
+                end += 1
+            rows = [row for row in lines[i:end] if not TABLE_RULE_RE.match(row)]
+            kept = rows[:table_rows + 1]  # header + body rows
+            result.extend(kept)
+            if len(rows) > len(kept):
+                result.append(f"({len(rows) - len(kept)} more rows)")
+            i = end
+        elif LIST_ITEM_RE.match(lines[i]):
+            end = i
+            while end < len(lines) and LIST_ITEM_RE.match(lines[end]):
+                end += 1
+            result.extend(lines[i:min(end, i + list_items)])
+            if end - i > list_items:
+                result.append(f"({end - i - list_items} more items)")
+            i = end
+        else:
+            result.append(lines[i])
+            i += 1
+    return result
+
+
+def fit_budget(lines: List[str], budget: int, keyword: Optional[str] = None) -> List[str]:
+    """Keeps lines in page order until budget is used: headings and lines matching the keyword
+    first, then the remaining lines from the top of the page"""
+    costs = [count_tokens(line) + 1 for line in lines]
+    if sum(costs) <= budget:
+        return lines
+
+    terms = _terms(keyword)
+
+    def priority(i):
+        line = lines[i]
+        matches = len(terms & set(WORD_RE.findall(line.lower()))) if terms else 0
+        return (-matches, not HEADING_RE.match(line), i)
+
+    keep = set()
+    used = 0
+    for i in sorted(range(len(lines)), key=priority):
+        if used + costs[i] <= budget:
+            keep.add(i)
+            used += costs[i]
+    return [line for i, line in enumerate(lines) if i in keep]
+
+
+def compact_markdown(markdown: str, budget: int = DEFAULT_BUDGET, keyword: Optional[str] = None) -> Dict:
+    """Returns {"markdown", "tokens_before", "tokens_after"}"""
+    lines = collapse_blocks(clean_lines(markdown))
+    # Boilerplate goes only from pages over budget - a page that fits is kept as it is
+    if sum(count_tokens(line) + 1 for line in lines) > budget:
+        lines = drop_boilerplate(lines, keyword)
+    compacted = "\n".join(fit_budget(lines, budget, keyword))
+    return {
+        "markdown": compacted,
+        "tokens_before": count_tokens(markdown),
+        "tokens_after": count_tokens(compacted)
+    }
+
+
+def compact_result(result: Dict, budget: int = DEFAULT_BUDGET, keyword: Optional[str] = None) -> Dict:
+    """Returns copy of crawl result with compacted markdown and a "compaction" token report"""
+    if not result.get("success") or not result.get("markdown"):
+        return result
+    compacted = compact_markdown(result["markdown"], budget, keyword or result.get("query"))
+    return dict(result, markdown=compacted["markdown"], compaction={
+        "budget": budget,
+        "tokens_before": compacted["tokens_before"],
+        "tokens_after": compacted["tokens_after"]
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact crawled markdown to a token budget.")
+    parser.add_argument("files", type=str, nargs="+", help="tasks/*.json result file(s)")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET,
+                        help=f"Token budget (default: {DEFAULT_BUDGET})")
+    parser.add_argument("--keyword", type=str, help="Keep passages matching keyword first (default: result query)")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite files instead of printing markdown")
+    args = parser.parse_args()
+
+    for path in args.files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not read {path}: {e}")
+            sys.exit(1)
+
+        compacted = compact_result(result, args.budget, args.keyword)
+        report = compacted.get("compaction")
+        if report is None:
+            print(f"⚠️ {path}: no markdown to compact")
+            continue
+        print(f"✂️ {path}: {report['tokens_before']} -> {report['tokens_after']} tokens")
+        if args.in_place:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(compacted, f, ensure_ascii=False, indent=4)
+        else:
+            print(compacted["markdown"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content hashing - detects whether fit markdown of a page changed since the previous crawl
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+# Ledger log is rewritten on load once it has this many lines and twice as many as live entries
+COMPACT_MIN_LINES = 1000
+COMPACT_RATIO = 2
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_markdown(markdown: str) -> str:
+    """Canonical form of markdown - NFKC, one space between words, no empty lines"""
+    text = unicodedata.normalize("NFKC", markdown or "")
+    lines = (WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def content_hash(markdown: str) -> str:
+    """SHA-256 of normalized markdown - whitespace-only edits keep the same hash"""
+    return hashlib.sha256(normalize_markdown(markdown).encode("utf-8")).hexdigest()
+
+
+class HashLedger:
+    """Last content hash per URL + filter mode + query, kept between runs in an append-only log.
+
+    Each changed hash is appended as one JSON line (last line wins), so long batch runs never
+    rewrite the file and runs sharing the ledger do not drop each other's entries. The log is
+    read on the first check and rewritten without superseded lines when they outnumber live ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    @staticmethod
+    def key(url: str, mode: str, query: Optional[str] = None) -> str:
+        return json.dumps([url, mode, query or None], ensure_ascii=False)
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries, lines = self._load()
+            if lines >= COMPACT_MIN_LINES and lines > COMPACT_RATIO * len(self._entries):
+                self._compact()
+        return self._entries
+
+    def _load(self) -> Tuple[Dict[str, Dict], int]:
+        entries = {}
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # last line of an interrupted write
+                    lines += 1
+                    if "key" in entry:
+                        entries[entry.pop("key")] = entry
+                    else:
+                        entries.update(entry)  # whole ledger saved as one JSON object by older versions
+        except OSError:
+            pass
+        return entries, lines
+
+    def _compact(self) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, entry in self._entries.items():
+                f.write(json.dumps(dict(entry, key=key), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _append(self, key: str, entry: Dict) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Opened per line - a run appending after another run compacted the log writes to the new file
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(dict(entry, key=key), ensure_ascii=False) + "\n")
+
+    def check(self, result: Dict) -> Dict:
+        """Sets result["changed"] against the previous crawl and records the new hash.
+        Failed results get changed=None and do not touch the ledger."""
+        if not result.get("success"):
+            result["changed"] = None
+            return result
+
+        # Results cached before hashing was added carry no hash yet
+        digest = result.get("content_hash") or content_hash(result.get("markdown", ""))
+        result["content_hash"] = digest
+
+        key = self.key(result["url"], result["filter"], result.get("query"))
+        previous = self.entries.get(key)
+        result["changed"] = previous is None or previous["hash"] != digest
+        if result["changed"]:
+            entry = {"hash": digest, "changed_at": time.time()}
+            self.entries[key] = entry
+            self._append(key, entry)
+        return result
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+On-disk crawl cache - stores crawl results keyed by URL + filter mode + BM25 query
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import urllib.request
+import urllib.error
+from typing import Dict, Optional, Tuple
+
+DEFAULT_TTL = 3600                      # seconds before an entry must be revalidated
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024   # total size of cache directory
+REVALIDATE_TIMEOUT = 10                 # seconds for conditional request
+EVICT_TARGET = 0.9                      # eviction frees down to this share of max_bytes
+
+# Cache states reported in result["cache"]
+HIT = "hit"        # fresh entry, served without network
+STALE = "stale"    # expired entry confirmed unchanged by server (304), served from cache
+MISS = "miss"      # no usable entry, page was crawled
+
+
+def _header(headers: Optional[Dict], name: str) -> Optional[str]:
+    """Case-insensitive header lookup"""
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def revalidate(url: str, etag: Optional[str], last_modified: Optional[str],
+               timeout: float = REVALIDATE_TIMEOUT) -> bool:
+    """Sends conditional GET - returns True if server answers 304 Not Modified"""
+    if not etag and not last_modified:
+        return False
+
+    request = urllib.request.Request(url, method="GET")
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout):
+            return False
+    except urllib.error.HTTPError as e:
+        return e.code == 304
+    except Exception:
+        return False
+
+
+def _touch(path: str) -> None:
+    """Marks file as recently used"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def evict_lru(directory: str, max_bytes: int, suffix: str, target: Optional[int] = None) -> int:
+    """Removes oldest (by mtime) files with given suffix until directory fits in max_bytes
+    (down to target bytes when given) - returns remaining size of those files"""
+    try:
+        files = [e for e in os.scandir(directory) if e.name.endswith(suffix) and e.is_file()]
+    except OSError:
+        return 0
+
+    stats = []
+    for e in files:
+        try:
+            st = e.stat()
+        except OSError:
+            continue
+        stats.append((st.st_mtime, st.st_size, e.path))
+    total = sum(size for _, size, _ in stats)
+    if total <= max_bytes:
+        return total
+
+    target = max_bytes if target is None else target
+    for _, size, path in sorted(stats):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        if total <= target:
+            break
+    return total
+
+
+class SizeBudget:
+    """Running size of a cache directory kept in memory, so a write costs one stat instead of a
+    directory scan. The directory is scanned only when the estimate crosses max_bytes (which also
+    picks up files written by other processes) and is then trimmed to EVICT_TARGET of max_bytes."""
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.total: Optional[int] = None    # unknown until first scan
+
+    def grow(self, delta: int) -> None:
+        """Accounts for a file written (delta = new size - old size), evicting when over budget"""
+        if self.total is not None and self.total + delta <= self.max_bytes:
+            self.total += delta
+        else:
+            self.evict()
+
+    def evict(self) -> None:
+        self.total = evict_lru(self.directory, self.max_bytes, self.suffix, int(self.max_bytes * EVICT_TARGET))
+
+
+class CrawlCache:
+    """Directory of JSON entries with TTL and size-bounded LRU eviction.
+
+    Entry file mtime is used as last access time, so LRU order survives
+    between processes without a separate index file.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.budget = SizeBudget(cache_dir, max_bytes, '.json')
+
+    @staticmethod
+    def key(url: str, mode: str, query: Optional[str] = None) -> str:
+        """Cache key for URL + filter mode + query"""
+        raw = json.dumps([url, mode, query or None], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url: str, mode: str, query: Optional[str] = None) -> Tuple[Optional[Dict], str]:
+        """Returns (entry, state). State is HIT for fresh entries, STALE for expired
+        entries that need revalidation and MISS when nothing is cached."""
+        path = self._path(self.key(url, mode, query))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None, MISS
+
+        _touch(path)
+        if time.time() - entry.get('fetched_at', 0) <= self.ttl:
+            return entry, HIT
+        return entry, STALE
+
+    def put(self, url: str, mode: str, query: Optional[str], result: Dict,
+            headers: Optional[Dict] = None) -> None:
+        """Stores result with validators from response headers"""
+        entry = {
+            'fetched_at': time.time(),
+            'etag': _header(headers, 'etag'),
+            'last_modified': _header(headers, 'last-modified'),
+            'result': result
+        }
+        self.budget.grow(self._write(self._path(self.key(url, mode, query)), entry))
+
+    def refresh(self, url: str, mode: str, query: Optional[str], entry: Dict) -> None:
+        """Marks revalidated entry as fresh again"""
+        entry['fetched_at'] = time.time()
+        self.budget.grow(self._write(self._path(self.key(url, mode, query)), entry))
+
+    def evict(self) -> None:
+        """Removes least recently used entries until cache fits in max_bytes"""
+        self.budget.evict()
+
+    def _write(self, path: str, entry: Dict) -> int:
+        """Writes entry atomically - returns change of file size"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        old_size = _file_size(path)
+        os.replace(tmp_path, path)
+        return _file_size(path) - old_size
+
+
+class SnapshotStore:
+    """Gzipped HTML snapshots of fetched pages, one file per URL.
+
+    Content filters are applied to a stored snapshot offline, so prune output
+    and any number of BM25 queries need only one network fetch.
+    """
+
+    def __init__(self, snapshot_dir: str, max_age: Optional[float] = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.snapshot_dir = snapshot_dir
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.budget = SizeBudget(snapshot_dir, max_bytes, '.json.gz')
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.snapshot_dir, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json.gz")
+
+    def get(self, url: str, any_age: bool = False) -> Optional[Dict]:
+        """Returns stored snapshot or None if missing or older than max_age"""
+        try:
+            with gzip.open(self._path(url), 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        _touch(self._path(url))
+        if not any_age and self.max_age is not None and time.time() - snapshot.get('fetched_at', 0) > self.max_age:
+            return None
+        return snapshot
+
+    def put(self, snapshot: Dict) -> None:
+        """Stores snapshot dict (must contain 'url')"""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = self._path(snapshot['url'])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=5) as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        old_size = _file_size(path)
+        os.replace(tmp_path, path)
+        self.budget.grow(_file_size(path) - old_size)
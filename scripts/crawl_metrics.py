@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crawl metrics - per-stage timings and sizes of crawl results aggregated into one metrics file
+"""
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Stages in pipeline order (milliseconds); missing stages did not run for the page
+STAGES = ("http_attempt", "browser_start", "navigation", "dom_ready", "download", "html_cleaning", "snapshot_load",
+          "cache_lookup", "content_filtering", "markdown_generation", "structured_data", "file_write")
+
+
+@contextmanager
+def timed(timings: Dict, stage: str):
+    """Adds elapsed milliseconds of the block to timings[stage]"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(timings.get(stage, 0.0) + (time.perf_counter() - started) * 1000, 1)
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class MetricsCollector:
+    """Collects timings of every result of a run and writes them with per-stage summaries."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.pages: List[Dict] = []
+
+    def add(self, result: Dict, file_write_ms: Optional[float] = None) -> None:
+        timings = dict(result.get("timings") or {})
+        if file_write_ms is not None:
+            timings["file_write"] = round(file_write_ms, 1)
+        self.pages.append({
+            "url": result.get("url"),
+            "filter": result.get("filter"),
+            "query": result.get("query"),
+            "success": result.get("success"),
+            "cache": result.get("cache"),
+            "fetcher": result.get("fetcher"),
+            "timings": timings,
+            "bytes": result.get("bytes") or {}
+        })
+
+    def summary(self) -> Dict:
+        stages = {}
+        for stage in STAGES:
+            values = [page["timings"][stage] for page in self.pages if page["timings"].get(stage) is not None]
+            if values:
+                stages[stage] = {
+                    "count": len(values),
+                    "total_ms": round(sum(values), 1),
+                    "mean_ms": round(sum(values) / len(values), 1),
+                    "p50_ms": _percentile(values, 0.5),
+                    "p95_ms": _percentile(values, 0.95),
+                    "max_ms": max(values)
+                }
+        return {
+            "results": len(self.pages),
+            "failed": sum(1 for page in self.pages if not page["success"]),
+            "wall_seconds": round(time.time() - self.started, 2),
+            "html_bytes": sum(page["bytes"].get("html", 0) for page in self.pages),
+            "markdown_bytes": sum(page["bytes"].get("markdown", 0) for page in self.pages),
+            "stages": stages
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"summary": self.summary(), "pages": self.pages}, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crawl scheduler - per-host concurrency and spacing, robots.txt rules and retry backoff
+"""
+import asyncio
+import random
+import time
+import urllib.request
+import urllib.robotparser
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+DEFAULT_PER_HOST = 2        # requests to one host at the same time
+DEFAULT_DELAY = 0.0         # seconds between request starts to one host
+DEFAULT_RETRIES = 2         # retries after the first attempt
+DEFAULT_BACKOFF = 1.0       # base of exponential backoff in seconds
+MAX_BACKOFF = 60.0
+ROBOTS_TIMEOUT = 10
+ROBOTS_USER_AGENT = "*"
+
+# Statuses worth retrying - everything else (404, 403, ...) fails immediately
+TRANSIENT_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+def is_transient(status: Optional[int]) -> bool:
+    """Network errors and timeouts (no status) and overload statuses are retried"""
+    return status is None or status in TRANSIENT_STATUSES
+
+
+def backoff_delay(attempt: int, base: float = DEFAULT_BACKOFF, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with full jitter; numeric Retry-After header wins when present"""
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF)
+        except ValueError:
+            pass
+    return random.uniform(0, min(base * (2 ** attempt), MAX_BACKOFF))
+
+
+class _Host:
+    __slots__ = ('slots', 'lock', 'next_start', 'robots')
+
+    def __init__(self, per_host: int):
+        self.slots = asyncio.Semaphore(per_host)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+        self.robots = None
+
+
+def _read_robots(url: str, timeout: float = ROBOTS_TIMEOUT) -> urllib.robotparser.RobotFileParser:
+    parser = urllib.robotparser.RobotFileParser()
+    parsed = urlparse(url)
+    parser.set_url(f"{parsed.scheme}://{parsed.netloc}/robots.txt")
+    try:
+        with urllib.request.urlopen(parser.url, timeout=timeout) as response:
+            parser.parse(response.read().decode('utf-8', errors='replace').splitlines())
+    except Exception as e:
+        code = getattr(e, 'code', None)
+        if code in (401, 403):
+            parser.disallow_all = True
+        else:
+            parser.allow_all = True  # missing or unreachable robots.txt allows everything
+    return parser
+
+
+class HostScheduler:
+    """Limits concurrent requests and spacing per host and applies robots.txt rules."""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST, delay: float = DEFAULT_DELAY,
+                 respect_robots: bool = True, user_agent: str = ROBOTS_USER_AGENT):
+        self.per_host = max(1, per_host)
+        self.delay = delay
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self._hosts: Dict[str, _Host] = {}
+
+    def _host(self, url: str) -> _Host:
+        host = urlparse(url).netloc.lower()
+        if host not in self._hosts:
+            self._hosts[host] = _Host(self.per_host)
+        return self._hosts[host]
+
+    async def _robots(self, url: str, host: _Host):
+        async with host.lock:
+            if host.robots is None:
+                host.robots = await asyncio.to_thread(_read_robots, url)
+        return host.robots
+
+    async def allowed(self, url: str) -> bool:
+        """True if robots.txt allows fetching the URL"""
+        if not self.respect_robots:
+            return True
+        robots = await self._robots(url, self._host(url))
+        return robots.can_fetch(self.user_agent, url)
+
+    async def spacing(self, url: str) -> float:
+        """Seconds between request starts - the larger of --delay and robots.txt Crawl-delay"""
+        if not self.respect_robots:
+            return self.delay
+        robots = await self._robots(url, self._host(url))
+        return max(self.delay, float(robots.crawl_delay(self.user_agent) or 0))
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Holds one of the host's request slots, started no sooner than spacing after the previous one"""
+        host = self._host(url)
+        spacing = await self.spacing(url)
+        async with host.slots:
+            async with host.lock:
+                now = time.monotonic()
+                start = max(now, host.next_start)
+                host.next_start = start + spacing
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
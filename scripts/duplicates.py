@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Duplicate assets - exact and near-duplicate headlines / descriptions within an ad set and across ad groups
+"""
+import re
+import sys
+import json
+import math
+import argparse
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Iterator, List, Tuple
+
+DEFAULT_THRESHOLD = 0.5     # token Jaccard - 3-word texts differing by one word are near-duplicates
+EDIT_THRESHOLD = 0.85       # character similarity (1 - edit distance / length) - typos, inflections
+MIN_SHARED = 2              # Jaccard match needs at least this many common words
+# Boilerplate words ("darmowa dostawa" in every description) never pair texts on their own
+COMMON_SHARE = 0.01         # share of texts containing a word that makes it boilerplate ...
+COMMON_MIN = 1000           # ... when at least this many texts contain it
+DEFAULT_FIELDS = ('headlines', 'long_headlines', 'descriptions')
+PAIRWISE_MAX = 64           # distinct texts compared pairwise without building an index
+CACHE_SIZE = 1 << 16        # normalized texts kept per process
+DEFAULT_TOP = 20            # largest duplicate groups shown by the CLI
+SHOWN_ASSETS = 5            # assets printed per group (all of them go to --output)
+
+WORD_RE = re.compile(r"[^\w]+")
+COMBINING_RE = re.compile(r"[\u0300-\u036f]")     # accents left by NFKD (ą -> a + U+0328)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize(text: str) -> str:
+    """Case, accents, punctuation and spacing removed - equal keys are exact duplicates"""
+    text = text.casefold()
+    if not text.isascii():
+        text = COMBINING_RE.sub('', unicodedata.normalize('NFKD', text)).replace('ł', 'l')
+    return ' '.join(WORD_RE.sub(' ', text).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def word_set(key: str) -> frozenset:
+    return frozenset(key.split())
+
+
+def edit_similarity(a: str, b: str, minimum: float = 0.0) -> float:
+    """1 - Levenshtein distance / longer length; 0.0 as soon as it cannot reach minimum"""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    budget = int(longest * (1 - minimum))
+    if abs(len(a) - len(b)) > budget:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > budget:
+            return 0.0
+        previous = current
+    return 1 - previous[-1] / longest
+
+
+def _typo_candidates(sets: List[frozenset]) -> Iterator[Tuple[int, int]]:
+    """Pairs (a, b) of word sets differing by at most one word on each side - the only pairs the
+    typo rule accepts. Every set is indexed under itself and each set of all its words but one, which
+    such a pair always shares (one word replaced), or which is the smaller set itself (one word added).
+    Such a pair shares exactly one key, so it is yielded once. Sets are keyed by the sum of their word
+    hashes; a collision only adds a candidate."""
+    index = {}
+    for b, words in enumerate(sets):
+        hashes = [hash(word) for word in words]
+        total = sum(hashes)
+        for key in {total, *(total - h for h in hashes)}:
+            postings = index.get(key)
+            if postings is None:
+                index[key] = [b]
+                continue
+            for a in postings:
+                yield a, b
+            postings.append(b)
+
+
+def _candidates(sets: List[frozenset], threshold: float) -> Iterator[Tuple[int, int]]:
+    """Pairs (a, b) of word sets that may reach threshold, |a| <= |b|.
+
+    Prefix filter (AllPairs): words are ordered rarest first and a set is looked up by, and indexed
+    under, only the first words it cannot match without (|set| - required overlap + 1), so two sets
+    reaching the Jaccard threshold always meet in some index entry while common words ("do", "the")
+    are rarely indexed. Boilerplate words are never indexed, so near-duplicates must share a
+    distinctive word."""
+    sizes = [len(words) for words in sets]
+    frequency = Counter(word for words in sets for word in words)
+    common = max(COMMON_MIN, COMMON_SHARE * len(sets))
+    index = defaultdict(list)
+    # Ascending size: sets already indexed are never larger than the probing one
+    for b in sorted(range(len(sets)), key=sizes.__getitem__):
+        size = sizes[b]
+        ordered = sorted(sets[b], key=lambda word: (frequency[word], word))
+        # Overlap needed with any indexed (not larger) set, and with any set probing later (not smaller)
+        probe = min(size, max(math.ceil(threshold * size), MIN_SHARED))
+        indexed = min(size, max(math.ceil(2 * threshold / (1 + threshold) * size), MIN_SHARED))
+        candidates = set()
+        for position, word in enumerate(ordered[:size - probe + 1]):
+            if frequency[word] > common:
+                break
+            postings = index[word]
+            candidates.update(postings)
+            if position < size - indexed + 1:
+                postings.append(b)
+        smallest = min(threshold * size, size - 1)
+        for a in candidates:
+            if sizes[a] >= smallest:
+                yield a, b
+
+
+def similar_keys(keys: List[str], threshold: float = DEFAULT_THRESHOLD) -> Iterator[Tuple[int, int, float]]:
+    """(a, b, similarity) of distinct normalized keys that are near-duplicates. Keys with the same
+    word set are hashed together; the rest are compared pairwise when few (one ad set), otherwise
+    only candidates of the prefix-filter index (Jaccard) and of the one-word-off index (typos) are."""
+    by_set = {}
+    for i, key in enumerate(keys):
+        by_set.setdefault(word_set(key), []).append(i)
+    for members in by_set.values():
+        for other in members[1:]:
+            yield members[0], other, 1.0
+
+    sets = list(by_set)
+    sizes = [len(words) for words in sets]
+    first = [members[0] for members in by_set.values()]
+    if len(sets) <= PAIRWISE_MAX:
+        passes = ((combinations(range(len(sets)), 2), True, True),)
+    else:
+        # (candidates, Jaccard matches reported, typos reported) - every pair is reported by one index only
+        passes = ((_candidates(sets, threshold), True, False), (_typo_candidates(sets), False, True))
+    for candidates, jaccard, typos in passes:
+        for a, b in candidates:
+            shared = len(sets[a] & sets[b])
+            union = sizes[a] + sizes[b] - shared
+            if shared >= MIN_SHARED and shared >= threshold * union:
+                if not jaccard:
+                    continue
+                similarity = shared / union
+            # Typo or inflection: at most one word differs on each side and the characters nearly match
+            elif typos and union - shared <= 2 and max(sizes[a], sizes[b]) - shared <= 1:
+                similarity = edit_similarity(keys[first[a]], keys[first[b]], EDIT_THRESHOLD)
+                if similarity < EDIT_THRESHOLD:
+                    continue
+            else:
+                continue
+            pair = (first[a], first[b]) if first[a] < first[b] else (first[b], first[a])
+            yield pair[0], pair[1], round(similarity, 2)
+
+
+def duplicate_pairs(texts: List[str], threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[int, int, float]]:
+    """(i, j, similarity) of duplicate texts, i < j; similarity 1.0 = exact after normalize().
+    Exact copies are hashed together and paired with their first occurrence only."""
+    groups = {}
+    for i, text in enumerate(texts):
+        key = normalize(text)
+        if key:
+            groups.setdefault(key, []).append(i)
+    pairs = [(members[0], j, 1.0) for members in groups.values() for j in members[1:]]
+    keys = list(groups)
+    for a, b, similarity in similar_keys(keys, threshold):
+        first, second = sorted((groups[keys[a]][0], groups[keys[b]][0]))
+        pairs.append((first, second, similarity))
+    return sorted(pairs)
+
+
+def duplicate_groups(texts: List[str], threshold: float = DEFAULT_THRESHOLD) -> List[List[int]]:
+    """Indices of texts grouped around a first text they all duplicate, most similar pairs assigned
+    first - no chaining of near-duplicates into one group; groups of 2+ only, largest first"""
+    center = {}
+    for i, j, _ in sorted(duplicate_pairs(texts, threshold), key=lambda pair: (-pair[2], pair[0], pair[1])):
+        if i not in center and j not in center:
+            center[i] = center[j] = i
+        elif center.get(i) == i and j not in center:
+            center[j] = i
+        elif center.get(j) == j and i not in center:
+            center[i] = j
+    groups = defaultdict(list)
+    for i in sorted(center):
+        groups[center[i]].append(i)
+    return sorted(groups.values(), key=lambda members: (-len(members), members[0]))
+
+
+def audit(ads: Iterator[Tuple[str, object]], fields: Tuple[str, ...] = DEFAULT_FIELDS,
+          threshold: float = DEFAULT_THRESHOLD, scope: str = 'campaign') -> List[Dict]:
+    """Duplicate groups across ad sets, per campaign (scope=campaign) or over all ads (scope=account)"""
+    assets = defaultdict(list)      # (scope key, field) -> [(source, index, text)]
+    for source, ad_data in ads:
+        if not isinstance(ad_data, dict):
+            continue
+        campaign = ad_data.get('campaign_name', '') if scope == 'campaign' else ''
+        for field in fields:
+            values = ad_data.get(field)
+            if isinstance(values, list):
+                assets[(campaign, field)].extend((source, i, text) for i, text in enumerate(values, 1)
+                                                 if isinstance(text, str))
+
+    found = []
+    for (campaign, field), items in assets.items():
+        for members in duplicate_groups([text for _, _, text in items], threshold):
+            group = [items[i] for i in members]
+            found.append({
+                'campaign_name': campaign,
+                'field': field,
+                'size': len(group),
+                'ad_sets': len({source for source, _, _ in group}),
+                'exact': len({normalize(text) for _, _, text in group}) == 1,
+                'assets': [{'source': source, 'index': i, 'text': text} for source, i, text in group]
+            })
+    found.sort(key=lambda group: (-group['ad_sets'], -group['size']))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate assets across ad sets.")
+    parser.add_argument('inputs', type=str, nargs='+',
+                        help='Directories, glob patterns, .json / .jsonl files or - for JSONL on stdin')
+    parser.add_argument('--scope', type=str, choices=('campaign', 'account'), default='campaign',
+                        help='Compare ad groups of the same campaign or the whole account (default: campaign)')
+    parser.add_argument('--fields', type=str, default=','.join(DEFAULT_FIELDS),
+                        help=f'Comma-separated fields to compare (default: {",".join(DEFAULT_FIELDS)})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Word Jaccard similarity for near-duplicates (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('-o', '--output', type=str, help='Write every duplicate group as JSONL')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help=f'Largest groups shown (default: {DEFAULT_TOP})')
+    args = parser.parse_args()
+
+    # Imported here - validate_batch depends on ad_rules, which uses this module
+    from validate_batch import iter_ads
+
+    fields = tuple(field.strip() for field in args.fields.split(',') if field.strip())
+    groups = audit(iter_ads(args.inputs, (args.output,) if args.output else ()), fields,
+                   args.threshold, args.scope)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for group in groups:
+                f.write(json.dumps(group, ensure_ascii=False) + '\n')
+
+    cross = sum(1 for group in groups if group['ad_sets'] > 1)
+    print(f"🔁 Duplicate groups: {len(groups)} ({cross} across ad groups, "
+          f"{sum(1 for group in groups if group['exact'])} exact)")
+    for group in groups[:args.top]:
+        kind = "exact" if group['exact'] else "near"
+        campaign = f"{group['campaign_name']} / " if group['campaign_name'] else ""
+        print(f"\n⚠️ {campaign}{group['field']}: {group['size']} {kind} duplicates in {group['ad_sets']} ad set(s)")
+        for asset in group['assets'][:SHOWN_ASSETS]:
+            print(f"   {asset['source']} #{asset['index']}: \"{asset['text']}\"")
+        if group['size'] > SHOWN_ASSETS:
+            print(f"   ... and {group['size'] - SHOWN_ASSETS} more")
+    if args.output:
+        print(f"\n📁 All groups saved in: {args.output}")
+
+    sys.exit(1 if cross else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Editorial policy - Google Ads editorial rules compiled into one regex, every violation with its position
+"""
+import re
+import sys
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Upper-case letters of Latin scripts (Polish, German, French, ...) - re has no \p{Lu}
+UPPER = "".join(re.escape(chr(cp)) for cp in range(0x250) if chr(cp).isupper())
+# Characters of \s spelled out - a category in the leading class of the prefilter disables its fast scan
+SPACE = "".join(re.escape(chr(cp)) for cp in range(0x3001) if chr(cp).isspace())
+SYMBOLS = r"*^~|\\<>{}\[\]=#@•★☆✓✔✗✘→←↑↓►◄▶◀■□●○♥❤\u2600-\u27bf\U0001f000-\U0001faff"
+CAPS_MIN = 4                # upper-case words this long are shouting; shorter ones are acronyms (SEO, USA)
+
+
+def caps_pattern(caps_min: int = CAPS_MIN, acronyms: Tuple[str, ...] = ()) -> str:
+    """excessive_caps rule - upper-case words of caps_min+ letters, except the listed acronyms"""
+    allowed = rf"(?!(?:{'|'.join(map(re.escape, acronyms))})(?!\w))" if acronyms else ""
+    return rf"(?<!\w){allowed}[{UPPER}]{{{caps_min},}}(?!\w)"
+
+
+# A number is a phone number only in phone context - country code, "tel." / "zadzwoń", area code in
+# brackets or the 3-3-3 mobile grouping - so addresses (12/34 00-950), years and product codes pass
+PHONE = r"""(?x:
+    (?<![\w+/])
+    (?:
+        (?:\+|\b00)(?=(?:[ .\-()]*\d){9})\d{2,3}[ .\-]?(?:\(\d{1,4}\)[ .\-]?)?\d{2,4}(?:[ .\-]?\d{2,4}){1,4}
+      | (?i:tel(?:efon)?|phone|call|zadzwo[nń]|infolinia)\W{0,3}
+        (?=(?:[ .\-()]*\d){9})(?:\(\d{1,4}\)[ .\-]?)?\d{2,4}(?:[ .\-]?\d{2,4}){2,4}
+      | (?=(?:[ .\-()]*\d){9})\(\d{2,4}\)[ .\-]?\d{2,4}(?:[ .\-]?\d{2,4}){1,3}
+      | (?<!\d[ \-])(?<!\d\d-\d{3}\ )\d{3}[ \-]\d{3}[ \-]\d{3}
+    )
+    (?!\w|[ .\-/]?\d)
+)"""
+
+# Rule name -> (regex, message, prefilter). The rules of a field are joined as named alternatives
+# "(?P<spacing>...)|(?P<excessive_caps>...)|..." and each text is scanned once; order decides
+# overlapping matches ("!!" is repeated punctuation, not two exclamation marks). The prefilter is
+# (first, follow): a character class and the regex right after it, found in every match (follow None
+# for one character); texts without any of them skip the scan.
+POLICIES = {
+    'spacing': (r"\A\s+|\s+\Z|\s{2,}", "Leading, trailing or double space", (SPACE, f"[{SPACE}]")),
+    'excessive_caps': (caps_pattern(), "Excessive capitalization", (UPPER, f"[{UPPER}]")),
+    'repeated_punctuation': (r"[!?]{2,}|\.{2,}|,{2,}|;{2,}|:{2,}", "Repeated punctuation",
+                             (r"!?.,;:", r"[!?.,;:]")),
+    'exclamation': (r"!", "Exclamation mark not allowed here", (r"!", None)),
+    # 9 digits hold three in a row or two digit groups - "30 dni" and "20%" skip the scan
+    'phone_number': (PHONE, "Phone number in ad text", (r"0-9", r"[0-9]{2}|[ .\-/()]{1,2}[0-9]")),
+    'disallowed_symbol': (f"[{SYMBOLS}]", "Disallowed symbol or emoji", (SYMBOLS, None)),
+}
+
+
+def _prefilter(rules) -> re.Pattern:
+    """Pattern found in every text that may break one of rules: jumps between first characters of the
+    rules' prefilters (re scans for a leading character class in C), then checks what follows.
+    Leading and trailing spaces are not covered - scan() checks text.strip() for them."""
+    pairs = [POLICIES[rule][2] for rule in rules]
+    branches = [f"(?<=[{first}])(?:{follow})" for first, follow in pairs if follow is not None]
+    single = "".join(first for first, follow in pairs if follow is None)
+    if single:
+        branches.append(f"(?<=[{single}])")
+    return re.compile(f"[{''.join(first for first, _ in pairs)}](?:{'|'.join(branches)})")
+
+
+class PolicyViolation:
+    """Editorial rule broken by text[start:end]"""
+    __slots__ = ('rule', 'start', 'end', 'match')
+
+    def __init__(self, rule: str, start: int, end: int, match: str):
+        self.rule = rule
+        self.start = start
+        self.end = end
+        self.match = match
+
+    @property
+    def message(self) -> str:
+        return POLICIES[self.rule][1]
+
+    def to_dict(self) -> Dict:
+        return {
+            'rule': self.rule,
+            'message': self.message,
+            'start': self.start,
+            'end': self.end,
+            'match': self.match
+        }
+
+
+class PolicyScanner:
+    """Rules of a field compiled into one regex - one pass per text, every violation with its position"""
+    __slots__ = ('rules', 'pattern', 'prefilter', 'edges')
+
+    def __init__(self, rules: Tuple[str, ...], caps_min: int = CAPS_MIN, acronyms: Tuple[str, ...] = ()):
+        unknown = [rule for rule in rules if rule not in POLICIES]
+        if unknown:
+            raise ValueError(f"Unknown editorial rule(s): {unknown}")
+        if caps_min < 2:
+            raise ValueError(f"caps_min must be at least 2, got {caps_min}")
+        self.rules = rules
+        patterns = {rule: POLICIES[rule][0] for rule in POLICIES if rule in rules}
+        if 'excessive_caps' in patterns:
+            patterns['excessive_caps'] = caps_pattern(caps_min, acronyms)
+        self.pattern = re.compile("|".join(f"(?P<{rule}>{pattern})" for rule, pattern in patterns.items())) \
+            if patterns else None
+        self.prefilter = _prefilter(patterns) if patterns else None
+        self.edges = 'spacing' in patterns
+
+    def scan(self, text: str) -> Tuple[PolicyViolation, ...]:
+        if self.pattern is None:
+            return ()
+        if self.prefilter.search(text) is None and not (self.edges and text.strip() != text):
+            return ()
+        return tuple(PolicyViolation(m.lastgroup, m.start(), m.end(), m.group()) for m in self.pattern.finditer(text))
+
+
+@lru_cache(maxsize=None)
+def compile_scanner(rules: Tuple[str, ...], caps_min: int = CAPS_MIN, acronyms: Tuple[str, ...] = ()) -> PolicyScanner:
+    """Scanner for a rule set, compiled once per process and shared by fields with the same rules"""
+    return PolicyScanner(rules, caps_min, acronyms)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: editorial.py [--headline] \"text1\" \"text2\" ...")
+        sys.exit(0)
+    texts = sys.argv[1:]
+    rules = tuple(rule for rule in POLICIES if rule != 'exclamation')
+    if texts[0] == '--headline':
+        texts = texts[1:]
+        rules += ('exclamation',)
+    scanner = compile_scanner(rules)
+    for text in texts:
+        violations = scanner.scan(text)
+        print(f'"{text}" - {"✅ OK" if not violations else f"❌ {len(violations)} violation(s)"}')
+        for violation in violations:
+            print(f"  {violation.start + 1}-{violation.end}: {violation.message} \"{violation.match}\"")
+
+
+if __name__ == "__main__":
+    main()
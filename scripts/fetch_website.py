@@ -1,11 +1,65 @@
 import os
+import sys
 import asyncio
 import argparse
 import re
 import json
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
-from crawl4ai.content_filter_strategy import BM25ContentFilter, PruningContentFilter
-from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+# crawl4ai takes about a second to import - it is imported only where a page is fetched or filtered,
+# so --help, cache hits and --output-path start fast (budget checked by bench_crawl.py --startup)
+from sitemap import iter_sitemap, filter_urls, sitemap_url_for
+from crawl_scheduler import (HostScheduler, is_transient, backoff_delay, DEFAULT_PER_HOST, DEFAULT_DELAY,
+                             DEFAULT_RETRIES, DEFAULT_BACKOFF)
+from crawl_cache import CrawlCache, SnapshotStore, revalidate, DEFAULT_TTL, DEFAULT_MAX_BYTES, HIT, STALE, MISS
+from content_hash import HashLedger, content_hash
+from near_duplicates import ResultDeduplicator, DEFAULT_SIMILARITY
+from task_store import TaskStore
+from compact_markdown import compact_result
+from structured_data import extract_structured
+from lean_profile import LeanProfile, PageMetrics, browser_config as lean_browser_config
+from crawl_metrics import MetricsCollector, timed
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tasks')
+CACHE_DIR = os.path.join(OUTPUT_DIR, '.cache')
+SNAPSHOT_DIR = os.path.join(OUTPUT_DIR, '.snapshots')
+HASH_LEDGER = os.path.join(OUTPUT_DIR, '.content_hashes.json')
+
+# Number of pages crawled at the same time in batch mode
+DEFAULT_CONCURRENCY = 4
+
+# Page snapshots kept in memory per session (older ones are re-read from SNAPSHOT_DIR)
+SNAPSHOTS_IN_MEMORY = 32
+
+# Crawl daemon (serve mode)
+DEFAULT_SERVE_PORT = 8765
+DEFAULT_POOL_SIZE = 4
+
+# HTTP fast path: pooled client settings
+HTTP_POOL_SIZE = 32
+HTTP_POOL_PER_HOST = 8
+HTTP_TIMEOUT = 30
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8"
+}
+
+# Static page heuristics - below these limits the page is crawled with the browser
+MIN_STATIC_TEXT = 200        # visible characters in <body>
+MIN_FRAMEWORK_TEXT = 1000    # visible characters when a JS framework mount point is present
+BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript|template)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+TAG_RE = re.compile(r"<[^>]+>")
+JS_FRAMEWORK_RE = re.compile(
+    r'<div id="(?:root|app|__next|__nuxt)"[^>]*>\s*</div>|\bng-version=|\bdata-reactroot\b|'
+    r'<noscript>[^<]*(?:enable|requires?)\s+javascript',
+    re.IGNORECASE
+)
+
+# Cache key mode of results scored by the local numpy BM25 engine
+LOCAL_BM25 = "bm25-numpy"
 
 def sanitize_filename(name):
     """Remove or replace characters that are not allowed in filenames."""
@@ -13,142 +67,1012 @@ def sanitize_filename(name):
     name = re.sub(r'[<>:"/\\|?*]', '_', name)
     return name
 
-async def crawl_prune(url: str):
-    """Crawl URL with PruningContentFilter - removes boilerplate, keeps all content."""
-    prune_filter = PruningContentFilter(
+def build_content_filter(mode: str, query: str = None):
+    """Returns content filter for given mode"""
+    from crawl4ai.content_filter_strategy import BM25ContentFilter, PruningContentFilter
+
+    if mode == "bm25":
+        return BM25ContentFilter(user_query=query)
+    return PruningContentFilter(
         threshold=0.45,
         threshold_type="dynamic",
         min_word_threshold=5
     )
 
-    md_generator = DefaultMarkdownGenerator(content_filter=prune_filter)
-    config = CrawlerRunConfig(markdown_generator=md_generator)
+def derive_markdown(snapshot: dict, mode: str, query: str = None, timings: dict = None) -> str:
+    """Applies content filter to stored page snapshot offline and returns fit markdown.
 
-    try:
-        async with AsyncWebCrawler() as crawler:
-            print(f"Crawling {url} with prune filter")
-            result = await crawler.arun(url=url, config=config)
-
-            if result.success:
-                print("✅ Successfully crawled page")
-                return {
-                    "url": url,
-                    "filter": "prune",
-                    "query": None,
-                    "cache": "0",
-                    "markdown": result.markdown.fit_markdown or "",
-                    "success": True
-                }
-            else:
-                print(f"❌ Crawl failed: {result.error_message}")
-                return {
-                    "url": url,
-                    "filter": "prune",
-                    "query": None,
-                    "cache": "0",
-                    "markdown": "",
-                    "success": False
-                }
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        return {
+    Filter and markdown conversion run as separate timed stages - same output as
+    generate_markdown(content_filter=...), without converting the whole page to raw markdown.
+    """
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+    timings = {} if timings is None else timings
+    html = snapshot.get("cleaned_html") or snapshot.get("html") or ""
+    with timed(timings, "content_filtering"):
+        chunks = build_content_filter(mode, query).filter_content(html)
+    with timed(timings, "markdown_generation"):
+        fit_html = "\n".join("<div>{}</div>".format(chunk) for chunk in chunks)
+        result = DefaultMarkdownGenerator().generate_markdown(fit_html, base_url=snapshot["url"], citations=False)
+    return result.raw_markdown or ""
+
+def result_bytes(snapshot: dict, markdown: str) -> dict:
+    """Sizes of raw HTML and fit markdown in bytes"""
+    return {
+        "html": len((snapshot.get("html") or "").encode("utf-8")),
+        "markdown": len(markdown.encode("utf-8"))
+    }
+
+def format_timings(timings: dict) -> str:
+    return ", ".join(f"{stage} {ms:.0f} ms" for stage, ms in timings.items() if ms is not None)
+
+def page_structure(snapshot: dict) -> dict:
+    """Structured data of the snapshot's raw HTML, extracted once per snapshot"""
+    if "structured" not in snapshot:
+        snapshot["structured"] = extract_structured(snapshot.get("html") or "")
+    return snapshot["structured"]
+
+def make_result(url: str, mode: str, query: str = None, markdown: str = "", success: bool = False,
+                cache: str = "0", snapshot: dict = None) -> dict:
+    """Builds result dict saved to tasks/*.json"""
+    snapshot = snapshot or {}
+    return {
+        "url": url,
+        "filter": mode,
+        "query": query if mode == "bm25" else None,
+        "cache": cache,
+        "markdown": markdown,
+        "content_hash": content_hash(markdown) if success else None,
+        "success": success,
+        "attempts": snapshot.get("attempts", 0),
+        "error": snapshot.get("error"),
+        "fetcher": snapshot.get("fetcher"),
+        "lean": snapshot.get("lean"),
+        "structured": snapshot.get("structured"),
+        "timings": snapshot.get("timings"),
+        "bytes": None
+    }
+
+def visible_text_length(html: str) -> int:
+    """Approximate length of visible text - scripts, styles and tags removed"""
+    text = SCRIPT_STYLE_RE.sub(" ", html)
+    text = TAG_RE.sub(" ", text)
+    return len(" ".join(text.split()))
+
+def js_render_reason(html: str) -> str:
+    """Returns why page seems to need JavaScript rendering, or None for static HTML"""
+    body = BODY_RE.search(html)
+    if body is None or not body.group(1).strip():
+        return "empty body"
+    text_length = visible_text_length(body.group(1))
+    if text_length < MIN_STATIC_TEXT:
+        return f"too little text ({text_length} chars)"
+    marker = JS_FRAMEWORK_RE.search(html)
+    if marker and text_length < MIN_FRAMEWORK_TEXT:
+        return f"framework marker '{marker.group(0)[:40]}' with little text"
+    return None
+
+def clean_html(url: str, html: str) -> str:
+    """Runs crawl4ai scraping strategy on fetched HTML - same cleaning as in the browser crawl"""
+    from crawl4ai.content_scraping_strategy import WebScrapingStrategy
+
+    scraped = WebScrapingStrategy().scrap(url, html)
+    if isinstance(scraped, dict):
+        return scraped.get("cleaned_html") or html
+    return getattr(scraped, "cleaned_html", None) or html
+
+class CrawlSession:
+    """Shared crawl state: HTTP client and browser started on first use, page snapshots
+    and optional result cache.
+
+    Every URL is fetched at most once per session - concurrent requests for the same
+    page wait for the same fetch, and filters are derived from the snapshot.
+    Fetcher "auto" downloads HTML with the pooled HTTP client and launches the browser
+    only for pages that look JS-rendered. With lean=True the browser blocks images, fonts,
+    styles and trackers and browser snapshots carry "lean" statistics.
+    """
+
+    def __init__(self, cache: CrawlCache = None, snapshots: SnapshotStore = None, offline: bool = False,
+                 engine: str = "crawl4ai", fetcher: str = "auto", browser_pages: int = None,
+                 memory_ttl: float = None, scheduler: HostScheduler = None,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF, lean: bool = False):
+        self.cache = cache
+        self.scheduler = scheduler
+        self.retries = retries
+        self.backoff = backoff
+        self.snapshots = snapshots
+        self.offline = offline
+        self.engine = engine
+        self.fetcher = fetcher
+        self.lean = lean
+        # Lean profile also blocks heavy resources; both report time to DOMContentLoaded
+        self.page_metrics = LeanProfile() if lean else PageMetrics()
+        # Long-running sessions drop in-memory snapshots older than memory_ttl and failed fetches
+        self.memory_ttl = memory_ttl
+        self._crawler = None
+        self._http = None
+        self._lock = asyncio.Lock()
+        self._fetches = OrderedDict()
+        # Caps pages open in the browser at the same time (and so browser memory)
+        self._browser_slots = asyncio.Semaphore(browser_pages) if browser_pages else None
+
+    async def crawler(self):
+        """Returns running crawler, launching the browser only when a page must be fetched"""
+        from crawl4ai import AsyncWebCrawler
+
+        async with self._lock:
+            if self._crawler is None:
+                if self.lean:
+                    crawler = AsyncWebCrawler(config=lean_browser_config())
+                else:
+                    crawler = AsyncWebCrawler()
+                self.page_metrics.install(crawler)
+                await crawler.start()
+                self._crawler = crawler
+        return self._crawler
+
+    async def http_client(self):
+        """Returns pooled HTTP client shared by all fetches of the session"""
+        import aiohttp
+
+        async with self._lock:
+            if self._http is None:
+                self._http = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, limit_per_host=HTTP_POOL_PER_HOST),
+                    timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+                    headers=HTTP_HEADERS
+                )
+        return self._http
+
+    async def snapshot(self, url: str) -> dict:
+        """Returns page snapshot, fetching it only if not fetched in this session or stored on disk"""
+        fetch = self._fetches.get(url)
+        if fetch is not None and self.memory_ttl is not None and fetch.done() and not self._usable(fetch.result()):
+            fetch = None
+        if fetch is None:
+            fetch = asyncio.ensure_future(self._load_snapshot(url))
+            self._fetches[url] = fetch
+            while len(self._fetches) > SNAPSHOTS_IN_MEMORY:
+                self._fetches.popitem(last=False)
+        else:
+            self._fetches.move_to_end(url)
+        return await fetch
+
+    def _usable(self, snapshot: dict) -> bool:
+        return snapshot["success"] and time.time() - snapshot.get("fetched_at", 0) <= self.memory_ttl
+
+    async def _load_snapshot(self, url: str) -> dict:
+        if self.snapshots:
+            timings = {}
+            with timed(timings, "snapshot_load"):
+                stored = self.snapshots.get(url, any_age=self.offline)
+            if stored:
+                print(f"📦 Using stored snapshot of {url}")
+                return dict(stored, attempts=0, timings=timings)
+        if self.offline:
+            return dict(self._failed_snapshot(url, None, "no stored snapshot"), attempts=0)
+
+        snapshot = await self._fetch_with_retries(url)
+        if self.snapshots and snapshot["success"]:
+            self.snapshots.put(snapshot)
+        return snapshot
+
+    async def _fetch_with_retries(self, url: str) -> dict:
+        """Fetches page within host limits, retrying transient failures with backoff"""
+        if self.scheduler and not await self.scheduler.allowed(url):
+            print(f"🚫 {url} is disallowed by robots.txt")
+            return dict(self._failed_snapshot(url, None, "disallowed by robots.txt"), attempts=0)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if self.scheduler:
+                    async with self.scheduler.slot(url):
+                        snapshot = await self._fetch(url)
+                else:
+                    snapshot = await self._fetch(url)
+            except Exception as e:
+                snapshot = self._failed_snapshot(url, None, str(e))
+            snapshot["attempts"] = attempt
+
+            if snapshot["success"] or attempt > self.retries or not is_transient(snapshot.get("status")):
+                return snapshot
+
+            delay = backoff_delay(attempt - 1, self.backoff, snapshot.get("retry_after"))
+            print(f"🔁 Retrying {url} in {delay:.1f}s ({snapshot['error']})")
+            await asyncio.sleep(delay)
+
+    async def _fetch(self, url: str) -> dict:
+        snapshot = None
+        http_ms = None
+        if self.fetcher != "browser":
+            snapshot, reason = await self._fetch_http(url)
+            if reason and self.fetcher == "auto":
+                print(f"↪️ Falling back to browser for {url}: {reason}")
+                http_ms = round(sum((snapshot.get("timings") or {}).values()), 1)
+                snapshot = None
+        if snapshot is None:
+            snapshot = await self._fetch_browser(url)
+            if http_ms is not None:
+                snapshot["timings"]["http_attempt"] = http_ms
+        return snapshot
+
+    async def _fetch_http(self, url: str):
+        """Downloads page without browser. Returns (snapshot, reason to fall back to browser or None)"""
+        print(f"Fetching {url} over HTTP")
+        timings = {}
+        try:
+            client = await self.http_client()
+            started = time.perf_counter()
+            async with client.get(url) as response:
+                timings["navigation"] = round((time.perf_counter() - started) * 1000, 1)
+                content_type = response.headers.get("Content-Type", "")
+                with timed(timings, "download"):
+                    html = await response.text(errors="replace")
+                headers = dict(response.headers)
+                status = response.status
+        except Exception as e:
+            failed = self._failed_snapshot(url, "http", str(e) or type(e).__name__)
+            return dict(failed, timings=timings), f"HTTP error: {e}"
+
+        if status in (404, 410):
+            # Page does not exist - browser would get the same answer
+            return self._failed_snapshot(url, "http", f"HTTP {status}", status), None
+        if status >= 400:
+            failed = self._failed_snapshot(url, "http", f"HTTP {status}", status)
+            failed["retry_after"] = headers.get("Retry-After")
+            if is_transient(status):
+                # Overloaded or rate-limited host - retried with backoff / Retry-After, not hit again by the browser
+                return dict(failed, timings=timings), None
+            return dict(failed, timings=timings), f"HTTP {status}"
+        if "html" not in content_type.lower():
+            failed = self._failed_snapshot(url, "http", f"not HTML ({content_type})", status)
+            return dict(failed, timings=timings), f"content type {content_type}"
+
+        with timed(timings, "html_cleaning"):
+            cleaned = await asyncio.to_thread(clean_html, url, html)
+
+        snapshot = {
             "url": url,
-            "filter": "prune",
-            "query": None,
-            "cache": "0",
-            "markdown": "",
-            "success": False
+            "fetched_at": time.time(),
+            "fetcher": "http",
+            "status": status,
+            "success": True,
+            "error": None,
+            "headers": headers,
+            "html": html,
+            "cleaned_html": cleaned,
+            "timings": timings
         }
+        return snapshot, js_render_reason(html)
 
+    async def _fetch_browser(self, url: str) -> dict:
+        from crawl4ai import CrawlerRunConfig
 
-async def crawl_bm25(url: str, query: str):
-    """Crawl URL with BM25 content filtering - filters by keyword relevance."""
-    bm25_filter = BM25ContentFilter(user_query=query)
+        timings = {}
+        with timed(timings, "browser_start"):
+            crawler = await self.crawler()
+        print(f"Crawling {url}")
+        # Fresh config per page - page metrics are keyed by it
+        config = CrawlerRunConfig()
+        if self._browser_slots:
+            async with self._browser_slots:
+                with timed(timings, "navigation"):
+                    result = await crawler.arun(url=url, config=config)
+        else:
+            with timed(timings, "navigation"):
+                result = await crawler.arun(url=url, config=config)
+        stats = self.page_metrics.pop(config) or {}
+        timings["dom_ready"] = stats.get("time_to_content_ms")
+        snapshot = {
+            "url": url,
+            "fetched_at": time.time(),
+            "fetcher": "browser",
+            "status": getattr(result, "status_code", None),
+            "success": bool(result.success),
+            "error": None if result.success else result.error_message,
+            "headers": dict(getattr(result, "response_headers", None) or {}),
+            "html": result.html or "",
+            "cleaned_html": result.cleaned_html or "",
+            "timings": timings
+        }
+        if self.lean:
+            snapshot["lean"] = stats
+            if stats:
+                print(f"🪶 {url}: {stats['blocked_requests']} requests blocked, "
+                      f"{stats.get('bytes_loaded', 0)} bytes loaded, "
+                      f"content after {stats.get('time_to_content_ms')} ms")
+        return snapshot
+
+    @staticmethod
+    def _failed_snapshot(url: str, fetcher: str, error: str, status: int = None) -> dict:
+        return {"url": url, "fetcher": fetcher, "status": status, "success": False, "error": error}
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        if self._crawler is not None:
+            await self._crawler.close()
+            self._crawler = None
+
+    async def __aenter__(self):
+        return self
 
-    md_generator = DefaultMarkdownGenerator(content_filter=bm25_filter)
-    config = CrawlerRunConfig(markdown_generator=md_generator)
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+async def cached_result(session: CrawlSession, url: str, mode: str, query: str = None) -> dict:
+    """Returns cached result (fresh or revalidated) or None when page must be crawled"""
+    entry, state = session.cache.get(url, mode, query)
+    if state == HIT:
+        print(f"⚡ Cache hit for {url}")
+        return dict(entry["result"], cache=HIT)
+
+    if state == STALE and await asyncio.to_thread(revalidate, url, entry.get("etag"), entry.get("last_modified")):
+        session.cache.refresh(url, mode, query, entry)
+        print(f"⚡ Cache revalidated for {url} (not modified)")
+        return dict(entry["result"], cache=STALE)
+
+    return None
+
+async def crawl_page(session: CrawlSession, url: str, mode: str, query: str = None) -> dict:
+    """Crawl URL within a session - shared by single and batch mode."""
+    query = query if mode == "bm25" else None
+    cache_state = "0"
+    if session.cache:
+        timings = {}
+        with timed(timings, "cache_lookup"):
+            cached = await cached_result(session, url, mode, query)
+        if cached:
+            return dict(cached, timings=timings)
+        cache_state = MISS
 
     try:
-        async with AsyncWebCrawler() as crawler:
-            print(f"Crawling {url} with BM25 filter, query: '{query}'")
-            result = await crawler.arun(url=url, config=config)
-
-            if result.success:
-                print("✅ Successfully crawled page")
-                return {
-                    "url": url,
-                    "filter": "bm25",
-                    "query": query,
-                    "cache": "0",
-                    "markdown": result.markdown.fit_markdown or "",
-                    "success": True
-                }
+        snapshot = await session.snapshot(url)
+
+        if snapshot["success"]:
+            if mode == "bm25":
+                print(f"Applying BM25 filter to {url}, query: '{query}'")
             else:
-                print(f"❌ Crawl failed: {result.error_message}")
-                return {
-                    "url": url,
-                    "filter": "bm25",
-                    "query": query,
-                    "cache": "0",
-                    "markdown": "",
-                    "success": False
-                }
+                print(f"Applying prune filter to {url}")
+            timings = dict(snapshot.get("timings") or {})
+            markdown = await asyncio.to_thread(derive_markdown, snapshot, mode, query, timings)
+            with timed(timings, "structured_data"):
+                await asyncio.to_thread(page_structure, snapshot)
+            print(f"✅ Successfully crawled page {url} ({format_timings(timings)})")
+            output = make_result(url, mode, query, markdown, True, cache_state, snapshot)
+            output["timings"] = timings
+            output["bytes"] = result_bytes(snapshot, markdown)
+            if session.cache:
+                session.cache.put(url, mode, query, output, snapshot.get("headers"))
+            return output
+        else:
+            print(f"❌ Crawl failed for {url}: {snapshot['error']}")
+            return make_result(url, mode, query, cache=cache_state, snapshot=snapshot)
+    except Exception as e:
+        print(f"❌ Error for {url}: {str(e)}")
+        return make_result(url, mode, query, cache=cache_state, snapshot={"error": str(e)})
+
+def derive_bm25_local(snapshot: dict, queries: list, timings: dict = None) -> dict:
+    """Scores all keywords against page chunks in one pass of the vectorized BM25 engine"""
+    from bm25_engine import BM25Index
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+    timings = {} if timings is None else timings
+    html = snapshot.get("cleaned_html") or snapshot.get("html") or ""
+    with timed(timings, "markdown_generation"):
+        markdown = DefaultMarkdownGenerator().generate_markdown(
+            html, base_url=snapshot["url"], citations=False).raw_markdown
+    with timed(timings, "content_filtering"):
+        return BM25Index.from_markdown(markdown).fit_markdown(queries)
+
+async def crawl_bm25_local(session: CrawlSession, url: str, queries: list) -> dict:
+    """Returns keyword -> BM25 result for all keywords, derived from one snapshot of the page"""
+    results = {}
+    missing = []
+    for query in dict.fromkeys(queries):
+        if session.cache:
+            timings = {}
+            with timed(timings, "cache_lookup"):
+                entry, state = session.cache.get(url, LOCAL_BM25, query)
+            if state == HIT:
+                results[query] = dict(entry["result"], cache=HIT, timings=timings)
+                continue
+        missing.append(query)
+
+    if not missing:
+        print(f"⚡ Cache hit for {url} ({len(results)} keywords)")
+        return results
+
+    cache_state = MISS if session.cache else "0"
+    try:
+        snapshot = await session.snapshot(url)
+        if not snapshot["success"]:
+            print(f"❌ Crawl failed for {url}: {snapshot['error']}")
+            results.update((q, make_result(url, "bm25", q, cache=cache_state, snapshot=snapshot)) for q in missing)
+            return results
+
+        print(f"Scoring {url} against {len(missing)} keywords with local BM25 engine")
+        # Stages shared by all keywords are reported on every keyword's result
+        timings = dict(snapshot.get("timings") or {})
+        markdowns = await asyncio.to_thread(derive_bm25_local, snapshot, missing, timings)
+        with timed(timings, "structured_data"):
+            await asyncio.to_thread(page_structure, snapshot)
+        for query in missing:
+            output = make_result(url, "bm25", query, markdowns[query], True, cache_state, snapshot)
+            output["engine"] = "numpy"
+            output["timings"] = timings
+            output["bytes"] = result_bytes(snapshot, markdowns[query])
+            if session.cache:
+                session.cache.put(url, LOCAL_BM25, query, output, snapshot.get("headers"))
+            results[query] = output
+        print(f"✅ Successfully crawled page {url} ({format_timings(timings)})")
+    except Exception as e:
+        print(f"❌ Error for {url}: {str(e)}")
+        error = {"error": str(e)}
+        results.update((q, make_result(url, "bm25", q, cache=cache_state, snapshot=error)) for q in missing)
+    return results
+
+async def crawl_targets(session: CrawlSession, url: str, targets) -> list:
+    """Crawls URL once and derives result for every (mode, keyword) target.
+
+    With the numpy engine all BM25 keywords are scored together in one matrix operation.
+    Returns list of (result, keyword) pairs in target order.
+    """
+    local = {}
+    if session.engine == "numpy":
+        queries = [keyword for mode, keyword in targets if mode == "bm25"]
+        if queries:
+            local = await crawl_bm25_local(session, url, queries)
+
+    results = []
+    for mode, keyword in targets:
+        if mode == "bm25" and keyword in local:
+            results.append((local[keyword], keyword))
+        else:
+            results.append((await crawl_page(session, url, mode, keyword), keyword))
+    return results
+
+async def crawl_prune(url: str, cache: CrawlCache = None, snapshots: SnapshotStore = None):
+    """Crawl URL with PruningContentFilter - removes boilerplate, keeps all content."""
+    try:
+        async with CrawlSession(cache, snapshots) as session:
+            return await crawl_page(session, url, "prune")
     except Exception as e:
         print(f"❌ Error: {str(e)}")
-        return {
-            "url": url,
-            "filter": "bm25",
-            "query": query,
-            "cache": "0",
-            "markdown": "",
-            "success": False
-        }
+        return make_result(url, "prune", snapshot={"error": str(e)})
+
+
+async def crawl_bm25(url: str, query: str, cache: CrawlCache = None, snapshots: SnapshotStore = None):
+    """Crawl URL with BM25 content filtering - filters by keyword relevance."""
+    try:
+        async with CrawlSession(cache, snapshots) as session:
+            return await crawl_page(session, url, "bm25", query)
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return make_result(url, "bm25", query, snapshot={"error": str(e)})
+
+async def _aiter(iterable):
+    for item in iterable:
+        yield item
+
+async def iter_in_thread(iterable, buffer: int = 256):
+    """Yields items of a blocking iterator (sitemap download and parsing, stdin) produced in a thread.
+
+    The event loop keeps crawling while the next items are read; the thread waits once buffer items are queued.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(buffer)
+    end = object()
+
+    def put(item, error=None):
+        asyncio.run_coroutine_threadsafe(queue.put((item, error)), loop).result()
+
+    def produce():
+        try:
+            for item in iterable:
+                put(item)
+        except Exception as e:
+            put(end, e)
+        else:
+            put(end)
+
+    # Daemon thread - a crawl stopped early must not wait for the rest of the sitemap
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item, error = await queue.get()
+        if item is end:
+            if error:
+                raise error
+            return
+        yield item
+
+async def crawl_batch(jobs, session: CrawlSession, concurrency: int = DEFAULT_CONCURRENCY, on_result=None) -> int:
+    """Crawls (url, targets) jobs within one session and a bounded number of workers.
+
+    Jobs are pulled lazily from the iterable (or async iterable), so the URL list is never held in memory.
+    Every finished result is passed to on_result(result, keyword). Returns number of crawled pages.
+    """
+    jobs = jobs if hasattr(jobs, "__anext__") else _aiter(jobs)
+    lock = asyncio.Lock()
+    crawled = 0
+
+    async def worker():
+        nonlocal crawled
+        while True:
+            # One worker at a time advances the shared generator
+            async with lock:
+                try:
+                    url, targets = await jobs.__anext__()
+                except StopAsyncIteration:
+                    return
+            for result, keyword in await crawl_targets(session, url, targets):
+                if on_result:
+                    on_result(result, keyword)
+            crawled += 1
+
+    async with session:
+        await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+
+    return crawled
+
+def read_jobs(source: str):
+    """Reads batch file (or stdin for '-'): one URL per line, optionally followed by a keyword.
+
+    Empty lines and lines starting with '#' are skipped.
+    """
+    f = sys.stdin if source == "-" else open(source, 'r', encoding='utf-8')
+    try:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url, _, keyword = line.partition(' ')
+            yield url, keyword.strip() or None
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+class JsonlWriter:
+    """Appends one JSON result per line, flushed immediately so partial runs survive interruption"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, result: dict):
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def jsonl_done_urls(path: str) -> set:
+    """Returns URLs already crawled successfully in existing JSONL file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue  # last line of an interrupted run
+            if result.get("success"):
+                done.add(result["url"])
+    return done
+
+def output_path(url: str, query: str = None, output_dir: str = OUTPUT_DIR) -> str:
+    """Returns tasks/*.json path for given URL and keyword"""
+    sanitized_url = sanitize_filename(url)
+
+    if query:
+        sanitized_query = sanitize_filename(query.replace(" ", "_"))
+        filename = f"{sanitized_url}:{sanitized_query}.json"
+    else:
+        filename = f"{sanitized_url}.json"
+
+    return os.path.join(output_dir, filename)
+
+def save_result(result: dict, query: str = None) -> str:
+    """Saves result to tasks/ directory and returns file path"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    filepath = output_path(result["url"], query)
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=4)
+
+    return filepath
+
+def add_session_arguments(parser: argparse.ArgumentParser):
+    """Options shared by CLI crawls and the serve daemon"""
+    parser.add_argument("--engine", type=str, choices=["crawl4ai", "numpy"], default="crawl4ai",
+                        help="BM25 engine: crawl4ai filter per keyword (default) or local numpy engine "
+                             "scoring all keywords at once")
+    parser.add_argument("--fetcher", type=str, choices=["auto", "http", "browser"], default="auto",
+                        help="auto (default): plain HTTP, browser only for JS-rendered pages; "
+                             "http: never launch browser; browser: always use headless browser")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Requests to one host at the same time (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--delay", type=float, default=DEFAULT_DELAY,
+                        help="Seconds between requests to one host; robots.txt Crawl-delay is used "
+                             "when larger (default: 0)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help=f"Retries of transient failures - timeouts, 429, 5xx (default: {DEFAULT_RETRIES})")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF,
+                        help=f"Base of exponential retry backoff in seconds, with jitter (default: {DEFAULT_BACKOFF})")
+    parser.add_argument("--compact-tokens", type=int, metavar="N",
+                        help="Compact markdown for the LLM to N tokens: repeated lines, link URLs and "
+                             "boilerplate removed, long lists/tables collapsed, keyword passages kept first")
+    parser.add_argument("--lean", action="store_true",
+                        help="Lean browser profile: block images, media, fonts, stylesheets and trackers, "
+                             "disable unneeded browser features and report blocked requests and "
+                             "time-to-content per page")
+    parser.add_argument("--ignore-robots", action="store_true",
+                        help="Do not read robots.txt (Disallow rules and Crawl-delay)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always crawl, do not read or write the local crawl cache and page snapshots")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL,
+                        help=f"Seconds before a cached page is revalidated (default: {DEFAULT_TTL})")
+    parser.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024),
+                        help=f"Maximum cache size in MB (default: {DEFAULT_MAX_BYTES // (1024 * 1024)})")
+
+def build_session(args, parser: argparse.ArgumentParser, **kwargs) -> CrawlSession:
+    """Creates crawl session from parsed session options"""
+    if args.engine == "numpy":
+        try:
+            import bm25_engine  # noqa: F401
+        except ImportError:
+            parser.error("--engine numpy requires numpy (pip install numpy)")
+
+    cache = None
+    snapshots = None
+    max_bytes = int(args.cache_max_mb * 1024 * 1024)
+    if not args.no_cache:
+        cache = CrawlCache(CACHE_DIR, ttl=args.cache_ttl, max_bytes=max_bytes)
+    if not args.no_cache or kwargs.get("offline"):
+        snapshots = SnapshotStore(SNAPSHOT_DIR, max_age=args.cache_ttl, max_bytes=max_bytes)
+    scheduler = HostScheduler(per_host=args.per_host, delay=args.delay, respect_robots=not args.ignore_robots)
+    return CrawlSession(cache, snapshots, engine=args.engine, fetcher=args.fetcher, scheduler=scheduler,
+                        retries=max(0, args.retries), backoff=args.backoff, lean=args.lean, **kwargs)
+
+async def serve(argv: list):
+    """Runs crawl daemon: warm browser and caches kept between requests of a local HTTP API"""
+    from aiohttp import web
+
+    parser = argparse.ArgumentParser(
+        prog="fetch_website.py serve",
+        description="Serve crawl requests over a local HTTP API with a warm browser.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Endpoints:
+  POST /crawl  {"url": ..., "mode": "prune"|"bm25", "query": ..., "save": false}
+               Returns the same JSON as tasks/*.json. "keywords": [...] instead of
+               "query" returns a list of results derived from one fetch.
+  GET  /crawl?url=...&mode=...&query=...   (or &keywords=a,b)
+  GET  /health
+
+Examples:
+  python3 %(prog)s --port 8765
+  python3 %(prog)s --socket /tmp/fetch_website.sock --pool-size 2
+        """
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_SERVE_PORT,
+                        help=f"Port to bind (default: {DEFAULT_SERVE_PORT})")
+    parser.add_argument("--socket", type=str, metavar="PATH", help="Listen on Unix socket instead of TCP")
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                        help=f"Browser pages open at the same time - caps browser memory (default: {DEFAULT_POOL_SIZE})")
+    add_session_arguments(parser)
+    args = parser.parse_args(argv)
+
+    session = build_session(args, parser, browser_pages=args.pool_size, memory_ttl=args.cache_ttl)
+    stats = {"requests": 0, "in_flight": 0}
+
+    async def crawl(request):
+        if request.method == "POST":
+            try:
+                params = await request.json()
+            except ValueError:
+                return web.json_response({"error": "request body must be JSON"}, status=400)
+            if not isinstance(params, dict):
+                return web.json_response({"error": "request body must be a JSON object"}, status=400)
+        else:
+            params = dict(request.query)
+            if "keywords" in params:
+                # GET takes keywords as one comma-separated parameter
+                params["keywords"] = [keyword.strip() for keyword in params["keywords"].split(",") if keyword.strip()]
+
+        url = params.get("url")
+        mode = params.get("mode", "prune")
+        keywords = params.get("keywords")
+        query = params.get("query") or params.get("q")
+        if keywords is not None and not (isinstance(keywords, list)
+                                         and all(isinstance(keyword, str) and keyword for keyword in keywords)):
+            return web.json_response({"error": "keywords must be a list of non-empty strings"}, status=400)
+        if not url:
+            return web.json_response({"error": "url is required"}, status=400)
+        if mode not in ("prune", "bm25"):
+            return web.json_response({"error": "mode must be prune or bm25"}, status=400)
+        if mode == "bm25" and not (query or keywords):
+            return web.json_response({"error": "mode bm25 requires query"}, status=400)
+
+        targets = [(mode, keyword) for keyword in (keywords or [query])]
+        save = str(params.get("save", "")).lower() in ("1", "true", "yes")
+        budget = params.get("budget")
+        try:
+            budget = (args.compact_tokens or 0) if budget in (None, "") else int(budget)
+        except (TypeError, ValueError):
+            return web.json_response({"error": "budget must be a number of tokens"}, status=400)
+
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        try:
+            results = await crawl_targets(session, url, targets)
+        finally:
+            stats["in_flight"] -= 1
+
+        if budget:
+            results = [(compact_result(result, budget, keyword), keyword) for result, keyword in results]
+        if save:
+            for result, keyword in results:
+                save_result(result, keyword)
+        if keywords is not None:
+            return web.json_response([result for result, _ in results], dumps=json_dumps)
+        return web.json_response(results[0][0], dumps=json_dumps)
+
+    async def health(request):
+        return web.json_response({
+            "status": "ok",
+            "browser": session._crawler is not None,
+            "requests": stats["requests"],
+            "in_flight": stats["in_flight"]
+        })
+
+    app = web.Application()
+    app.router.add_route("GET", "/crawl", crawl)
+    app.router.add_route("POST", "/crawl", crawl)
+    app.router.add_get("/health", health)
+
+    async with session:
+        if args.fetcher != "http":
+            print("Starting browser...")
+            await session.crawler()
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        if args.socket:
+            site = web.UnixSite(runner, args.socket)
+            where = args.socket
+        else:
+            site = web.TCPSite(runner, args.host, args.port)
+            where = f"http://{args.host}:{args.port}"
+        await site.start()
+        print(f"✅ Serving crawl API on {where}")
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+def json_dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False)
 
 async def main():
+    if sys.argv[1:2] == ["serve"]:
+        return await serve(sys.argv[2:])
+
     parser = argparse.ArgumentParser(
         description="Crawl a website with content filtering.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
   python3 %(prog)s https://example.com                    # Prune mode (default)
   python3 %(prog)s https://example.com "keyword"          # Prune mode with keyword in filename
   python3 %(prog)s https://example.com "keyword" --mode bm25  # BM25 mode
+  python3 %(prog)s https://example.com "kw1" "kw2" --mode bm25 --with-prune  # One fetch, three files
+  python3 %(prog)s https://example.com --keywords-file kw.txt --mode bm25 --engine numpy
+  python3 %(prog)s --batch urls.txt                       # Batch mode, one browser for all URLs
+  cat urls.txt | python3 %(prog)s --batch - --concurrency 8
+  python3 %(prog)s --sitemap https://example.com --include "/product/" --resume  # Whole site to JSONL
+  python3 %(prog)s serve --port 8765                      # Crawl daemon, see: %(prog)s serve --help
         """
     )
-    parser.add_argument("url", type=str, help="URL to crawl")
-    parser.add_argument("q", type=str, nargs="?", default=None,
-                        help="Keyword (optional for prune, required for bm25)")
+    parser.add_argument("url", type=str, nargs="?", default=None, help="URL to crawl")
+    parser.add_argument("q", type=str, nargs="*", default=[],
+                        help="Keyword(s) (optional for prune, required for bm25) - the page is fetched once for all of them")
     parser.add_argument("--mode", type=str, choices=["prune", "bm25"], default="prune",
                         help="Filter mode: prune (default) or bm25")
+    parser.add_argument("--with-prune", action="store_true",
+                        help="In bm25 mode also save prune output (domain.json) from the same fetch")
+    parser.add_argument("--output-path", action="store_true",
+                        help="Only print tasks/*.json path(s) the crawl would write, do not crawl")
+    parser.add_argument("--from-snapshot", action="store_true",
+                        help="Do not fetch - derive output from the stored page snapshot of any age")
+    parser.add_argument("--keywords-file", type=str, metavar="FILE",
+                        help="File with additional keywords, one per line (in batch mode used for every URL)")
+    parser.add_argument("--batch", type=str, metavar="FILE",
+                        help="File with URLs to crawl ('-' for stdin), one per line: URL [keyword]")
+    parser.add_argument("--sitemap", type=str, metavar="URL",
+                        help="Crawl all pages from sitemap.xml (or sitemap index) of a site")
+    parser.add_argument("--include", type=str, action="append", metavar="REGEX",
+                        help="Only crawl sitemap URLs matching regex (repeatable)")
+    parser.add_argument("--exclude", type=str, action="append", metavar="REGEX",
+                        help="Skip sitemap URLs matching regex (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of sitemap URLs to crawl")
+    parser.add_argument("--jsonl", type=str, metavar="FILE",
+                        help="Stream batch/site results to JSONL file, one line per result "
+                             "(default for --sitemap without --store: tasks/<domain>.jsonl)")
+    parser.add_argument("--store", type=str, metavar="DIR",
+                        help="Write results to a compressed, indexed task store instead of one "
+                             "tasks/*.json file per page (see scripts/task_store.py)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip URLs already crawled successfully in the JSONL file or task store")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="Only save/emit pages whose content changed since the last crawl")
+    parser.add_argument("--dedupe", type=str, choices=["off", "mark", "skip"], default="off",
+                        help="Near-duplicate pages (MinHash + LSH): mark them with duplicate_of or skip writing them")
+    parser.add_argument("--dedupe-similarity", type=float, default=DEFAULT_SIMILARITY,
+                        help=f"Estimated Jaccard similarity of page content to treat pages as near-duplicates "
+                             f"(default: {DEFAULT_SIMILARITY})")
+    parser.add_argument("--metrics", type=str, metavar="FILE",
+                        help="Write per-page stage timings and byte sizes with aggregated summary to a JSON file")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Pages crawled at the same time in batch mode (default: {DEFAULT_CONCURRENCY})")
+    add_session_arguments(parser)
     args = parser.parse_args()
 
-    # Validate: BM25 requires keyword
-    if args.mode == "bm25" and not args.q:
-        parser.error("--mode bm25 requires a keyword argument")
+    file_keywords = []
+    if args.keywords_file:
+        with open(args.keywords_file, 'r', encoding='utf-8') as f:
+            file_keywords = [line.strip() for line in f if line.strip()]
 
-    # Run appropriate crawler
-    if args.mode == "prune":
-        result = await crawl_prune(args.url)
-    else:
-        result = await crawl_bm25(args.url, args.q)
+    session = build_session(args, parser, offline=args.from_snapshot)
+    ledger = HashLedger(HASH_LEDGER)
+    store = TaskStore(args.store) if args.store else None
+    metrics = MetricsCollector() if args.metrics else None
+    dedupe = ResultDeduplicator(args.dedupe_similarity) if args.dedupe != "off" else None
 
-    # Save output
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tasks')
-    os.makedirs(output_dir, exist_ok=True)
+    def targets(keywords):
+        """(mode, keyword) pairs derived from one fetch of a page"""
+        result = [(args.mode, keyword) for keyword in keywords] or [(args.mode, None)]
+        if args.with_prune and args.mode == "bm25":
+            result.insert(0, ("prune", None))
+        return result
 
-    sanitized_url = sanitize_filename(args.url)
+    if args.batch or args.sitemap:
+        if args.batch and args.sitemap:
+            parser.error("use either --batch or --sitemap")
+        if args.url or args.q:
+            parser.error("--batch/--sitemap take URLs from the file or sitemap, not from arguments")
+        if args.jsonl and store is not None:
+            parser.error("use either --jsonl or --store")
 
-    if args.q:
-        sanitized_query = sanitize_filename(args.q.replace(" ", "_"))
-        filename = f"{sanitized_url}:{sanitized_query}.json"
-    else:
-        filename = f"{sanitized_url}.json"
+        if args.sitemap:
+            sitemap_url = sitemap_url_for(args.sitemap)
+            print(f"Reading sitemap {sitemap_url} - crawling starts with its first URLs")
+            # Read in a thread while pages are crawled, not downloaded and parsed up front
+            source = iter_in_thread((url, None) for url in
+                                    filter_urls(iter_sitemap(sitemap_url), args.include, args.exclude, args.limit))
+            # Sitemap results stream to tasks/<domain>.jsonl unless they go to the task store
+            jsonl_path = args.jsonl or (None if store is not None else
+                                        os.path.join(OUTPUT_DIR, f"{sanitize_filename(urlparse(sitemap_url).netloc)}.jsonl"))
+        else:
+            source = iter_in_thread(read_jobs(args.batch))
+            jsonl_path = args.jsonl
 
-    filepath = os.path.join(output_dir, filename)
+        writer = None
+        done = set()
+        if jsonl_path:
+            if args.resume:
+                done = jsonl_done_urls(jsonl_path)
+            writer = JsonlWriter(jsonl_path)
+            print(f"Streaming results to {jsonl_path}")
+        elif store is not None:
+            if args.resume:
+                done = store.done_urls()
+            print(f"Storing results in {args.store}")
+        elif args.resume:
+            parser.error("--resume needs --jsonl or --store")
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=4)
+        outputs = {"saved": 0, "failed": 0, "unchanged": 0, "duplicates": 0}
+
+        def on_result(result, keyword):
+            ledger.check(result)
+            if args.only_changed and result["changed"] is False:
+                outputs["unchanged"] += 1
+                return
+            if dedupe and dedupe.check(result)["duplicate_of"]:
+                outputs["duplicates"] += 1
+                if args.dedupe == "skip":
+                    print(f"⏭️ {result['url']} duplicates {result['duplicate_of']}, not saved")
+                    return
+            if args.compact_tokens:
+                result = compact_result(result, args.compact_tokens, keyword)
+            outputs["saved" if result["success"] else "failed"] += 1
+            started = time.perf_counter()
+            if writer:
+                writer.write(result)
+            elif store is not None:
+                store.put(result, keyword)
+            else:
+                print(f"Successfully saved output to {save_result(result, keyword)}")
+            if metrics:
+                metrics.add(result, (time.perf_counter() - started) * 1000)
+
+        async def jobs():
+            async for url, keyword in source:
+                if url in done:
+                    continue
+                keywords = ([keyword] if keyword else []) + file_keywords
+                if args.mode == "bm25" and not keywords:
+                    print(f"⚠️ Skipping {url}: --mode bm25 requires a keyword after the URL")
+                    continue
+                yield url, targets(keywords)
 
-    print(f"Successfully saved output to {filepath}")
+        try:
+            crawled = await crawl_batch(jobs(), session, args.concurrency, on_result)
+        finally:
+            if writer:
+                writer.close()
+            if store is not None:
+                store.close()
+            if metrics:
+                metrics.save(args.metrics)
+                print(f"Metrics saved to {args.metrics}")
+        print(f"\nBatch finished: {crawled} pages, {outputs['saved']} outputs saved, {outputs['failed']} failed, "
+              f"{outputs['unchanged']} unchanged, {outputs['duplicates']} near-duplicates")
+        return
+
+    if not args.url:
+        parser.error("the following arguments are required: url (or --batch FILE / --sitemap URL)")
+
+    keywords = args.q + file_keywords
+
+    # Validate: BM25 requires keyword
+    if args.mode == "bm25" and not keywords:
+        parser.error("--mode bm25 requires a keyword argument")
+
+    if args.output_path:
+        for _, keyword in targets(keywords):
+            print(output_path(args.url, keyword))
+        return
+
+    # Fetch page once, derive output for every keyword
+    async with session:
+        results = await crawl_targets(session, args.url, targets(keywords))
+
+    # Save output
+    for result, keyword in results:
+        ledger.check(result)
+        if args.only_changed and result["changed"] is False:
+            print(f"⏭️ {result['url']} unchanged since last crawl, not saved")
+            continue
+        if dedupe and dedupe.check(result)["duplicate_of"] and args.dedupe == "skip":
+            print(f"⏭️ {result['url']} duplicates {result['duplicate_of']}, not saved")
+            continue
+        if args.compact_tokens:
+            result = compact_result(result, args.compact_tokens, keyword)
+            report = result.get("compaction")
+            if report:
+                print(f"✂️ Compacted markdown: {report['tokens_before']} -> {report['tokens_after']} tokens")
+        started = time.perf_counter()
+        if store is not None:
+            store.put(result, keyword)
+            print(f"Successfully stored output in {args.store}")
+        else:
+            filepath = save_result(result, keyword)
+            print(f"Successfully saved output to {filepath}")
+        if metrics:
+            metrics.add(result, (time.perf_counter() - started) * 1000)
+    if store is not None:
+        store.close()
+    if metrics:
+        metrics.save(args.metrics)
+        print(f"Metrics saved to {args.metrics}")
 
 if __name__ == "__main__":
     asyncio.run(main())
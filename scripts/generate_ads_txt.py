@@ -9,6 +9,8 @@ import os
 import argparse
 from datetime import datetime
 
+from text_width import text_width
+
 def generate_ads_txt(validated_data: dict) -> str:
     """Generates formatted ad text for .txt file"""
     
@@ -109,8 +111,8 @@ def generate_ads_txt(validated_data: dict) -> str:
     lines.append("=" * 70)
     
     # Calculate average lengths
-    avg_headline_len = sum(len(h) for h in headlines) / len(headlines) if headlines else 0
-    avg_description_len = sum(len(d) for d in descriptions) / len(descriptions) if descriptions else 0
+    avg_headline_len = sum(text_width(h) for h in headlines) / len(headlines) if headlines else 0
+    avg_description_len = sum(text_width(d) for d in descriptions) / len(descriptions) if descriptions else 0
     
     lines.append(f"• Number of headlines: {len(headlines)} (required: 3-15)")
     lines.append(f"• Number of descriptions: {len(descriptions)} (required: 2-4)")
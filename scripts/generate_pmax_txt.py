@@ -9,6 +9,8 @@ import os
 import argparse
 from datetime import datetime
 
+from text_width import text_width
+
 MOBILE_HEADLINE_LIMIT = 15
 
 def generate_pmax_txt(validated_data: dict) -> str:
@@ -48,7 +50,7 @@ def generate_pmax_txt(validated_data: dict) -> str:
     mobile_count = 0
     for i, headline in enumerate(headlines, 1):
         mobile_tag = ""
-        if len(headline) <= MOBILE_HEADLINE_LIMIT:
+        if text_width(headline) <= MOBILE_HEADLINE_LIMIT:
             mobile_tag = " 📱"
             mobile_count += 1
         lines.append(f"{i:2}. {headline}{mobile_tag}")
@@ -163,9 +165,9 @@ def generate_pmax_txt(validated_data: dict) -> str:
     lines.append("=" * 70)
 
     # Calculate average lengths
-    avg_headline_len = sum(len(h) for h in headlines) / len(headlines) if headlines else 0
-    avg_long_headline_len = sum(len(h) for h in long_headlines) / len(long_headlines) if long_headlines else 0
-    avg_description_len = sum(len(d) for d in descriptions) / len(descriptions) if descriptions else 0
+    avg_headline_len = sum(text_width(h) for h in headlines) / len(headlines) if headlines else 0
+    avg_long_headline_len = sum(text_width(h) for h in long_headlines) / len(long_headlines) if long_headlines else 0
+    avg_description_len = sum(text_width(d) for d in descriptions) / len(descriptions) if descriptions else 0
 
     lines.append(f"• Number of headlines: {len(headlines)} (required: 3-15)")
     lines.append(f"• Number of long headlines: {len(long_headlines)} (required: 1-5)")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lean crawl profile - headless browser that loads only the document and scripts needed for text
+"""
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Playwright resource types never needed for fit_markdown
+BLOCKED_RESOURCE_TYPES = frozenset({
+    "image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket",
+    "manifest", "other"
+})
+
+# Analytics, ads and tag managers - blocked whatever the resource type
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "googleadservices.com", "facebook.net", "connect.facebook.com", "hotjar.com", "clarity.ms",
+    "bat.bing.com", "analytics.tiktok.com", "snap.licdn.com", "static.ads-twitter.com",
+    "cdn.segment.com", "cdn.mxpnl.com", "js.hs-analytics.net", "js.hs-scripts.com",
+    "cookiebot.com", "cdn.cookielaw.org", "onetrust.com", "quantserve.com", "scorecardresearch.com",
+    "criteo.com", "taboola.com", "outbrain.com", "adnxs.com", "smartlook.com", "mouseflow.com",
+    "fullstory.com", "newrelic.com", "nr-data.net", "sentry.io", "intercom.io", "zdassets.com",
+    "tawk.to", "livechatinc.com"
+)
+
+# Browser features not needed for text extraction
+LEAN_BROWSER_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-remote-fonts",
+    "--disable-features=MediaRouter,OptimizationHints,Translate",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Collected in the page before HTML is returned
+PAGE_METRICS_JS = """() => {
+    const nav = performance.getEntriesByType('navigation')[0] || {};
+    const resources = performance.getEntriesByType('resource');
+    return {
+        time_to_content_ms: nav.domContentLoadedEventEnd ? Math.round(nav.domContentLoadedEventEnd) : null,
+        bytes_loaded: (nav.transferSize || 0) + resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        resources_loaded: resources.length
+    };
+}"""
+
+
+def is_tracker(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in TRACKER_DOMAINS)
+
+
+def browser_config():
+    """BrowserConfig for the lean profile"""
+    from crawl4ai import BrowserConfig
+    return BrowserConfig(text_mode=True, light_mode=True, extra_args=list(LEAN_BROWSER_ARGS))
+
+
+class PageMetrics:
+    """Collects per-page browser metrics (time to DOMContentLoaded, bytes loaded) through crawler hooks.
+
+    Hooks are shared by all pages of the crawler, so statistics are keyed by
+    the CrawlerRunConfig object of each crawl - use a fresh config per arun().
+    """
+
+    def __init__(self):
+        self._stats: Dict[int, Dict] = {}
+
+    def install(self, crawler) -> None:
+        strategy = crawler.crawler_strategy
+        strategy.set_hook("on_page_context_created", self._on_page_created)
+        strategy.set_hook("before_return_html", self._before_return_html)
+
+    def pop(self, config) -> Optional[Dict]:
+        """Returns and forgets statistics of the crawl made with config"""
+        return self._stats.pop(id(config), None)
+
+    def _new_stats(self, config) -> Dict:
+        stats = {}
+        if config is not None:
+            self._stats[id(config)] = stats
+        return stats
+
+    async def _on_page_created(self, page, context=None, config=None, **kwargs):
+        self._new_stats(config)
+        return page
+
+    async def _before_return_html(self, page=None, html=None, context=None, config=None, **kwargs):
+        stats = self._stats.get(id(config)) if config is not None else None
+        if stats is not None and page is not None:
+            try:
+                stats.update(await page.evaluate(PAGE_METRICS_JS))
+            except Exception:
+                pass
+        return page
+
+
+class LeanProfile(PageMetrics):
+    """Page metrics plus blocking of heavy resource types and tracker domains"""
+
+    async def _on_page_created(self, page, context=None, config=None, **kwargs):
+        stats = self._new_stats(config)
+        stats.update(blocked_requests=0, blocked_by_type={})
+
+        async def route(route):
+            request = route.request
+            if request.resource_type in BLOCKED_RESOURCE_TYPES or is_tracker(request.url):
+                kind = "tracker" if is_tracker(request.url) else request.resource_type
+                stats["blocked_requests"] += 1
+                stats["blocked_by_type"][kind] = stats["blocked_by_type"].get(kind, 0) + 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route("**/*", route)
+        return page
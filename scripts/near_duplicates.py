@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate detection - MinHash signatures of page content with LSH banding
+"""
+import re
+import random
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+SHINGLE = 3                 # words per shingle
+NUM_HASHES = 128            # MinHash signature length
+BANDS = 16                  # LSH bands of NUM_HASHES // BANDS rows each
+DEFAULT_SIMILARITY = 0.8    # estimated Jaccard similarity of shingles to call pages near-duplicates
+MIN_SHINGLES = 8            # shorter pages are never marked as duplicates
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Fixed seed - signatures stay comparable between runs
+_RANDOM = random.Random(0x5EED)
+_MASKS = [_RANDOM.getrandbits(64) for _ in range(NUM_HASHES)]
+
+
+def _shingles(text: str) -> set:
+    words = TOKEN_RE.findall(text.lower())
+    return {" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1)}
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of word shingles, or None for text too short to compare"""
+    shingles = _shingles(text)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big') for s in shingles]
+    # XOR with a random mask acts as one permutation; map() keeps the inner loop in C
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity - share of equal signature positions"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class DuplicateDetector:
+    """Streaming near-duplicate index: each page is compared only with pages sharing an LSH band.
+
+    Pages whose signatures agree on all rows of at least one band become candidates,
+    so near-duplicates are found without comparing all pairs of pages.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_HASHES // bands
+        self._buckets: List[Dict[Tuple[int, ...], List[Tuple[Tuple[int, ...], str]]]] = [{} for _ in range(bands)]
+
+    def add(self, url: str, signature: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """Indexes page and returns URL of the first seen near-duplicate, or None if page is new"""
+        if signature is None:
+            return None
+        keys = [signature[band * self.rows:(band + 1) * self.rows] for band in range(self.bands)]
+        checked = set()
+        for band, key in enumerate(keys):
+            for other_signature, other_url in self._buckets[band].get(key, ()):
+                if other_url in checked or other_url == url:
+                    continue
+                checked.add(other_url)
+                if similarity(signature, other_signature) >= self.threshold:
+                    return other_url
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append((signature, url))
+        return None
+
+
+class ResultDeduplicator:
+    """Marks crawl results whose markdown nearly duplicates an earlier result of the same filter and query."""
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY):
+        self.threshold = threshold
+        self._detectors: Dict[Tuple[str, Optional[str]], DuplicateDetector] = {}
+
+    def check(self, result: Dict) -> Dict:
+        """Sets result["duplicate_of"] - URL of the kept page, or None"""
+        result["duplicate_of"] = None
+        if not result.get("success"):
+            return result
+
+        key = (result["filter"], result.get("query"))
+        if key not in self._detectors:
+            self._detectors[key] = DuplicateDetector(self.threshold)
+        result["duplicate_of"] = self._detectors[key].add(result["url"], minhash(result.get("markdown", "")))
+        return result
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Local search index - BM25 inverted index over crawled markdown, queried without network access
+"""
+import os
+import sys
+import json
+import glob
+import argparse
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from bm25_engine import tokenize, chunk_markdown, K1, B
+
+TASKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tasks')
+INDEX_DIR = os.path.join(TASKS_DIR, '.index')
+DEFAULT_TOP = 10
+PASSAGES_PER_PAGE = 3
+
+# Filter output preferred when one URL has several results - prune keeps the whole page
+FILTER_PRIORITY = {"prune": 0, "bm25": 1}
+
+
+def _iter_results(tasks_dir: str, stores: List[str]) -> Iterator[Dict]:
+    for path in sorted(glob.glob(os.path.join(tasks_dir, '*.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+        except (OSError, ValueError):
+            print(f"⚠️ Skipping unreadable {path}")
+    for path in sorted(glob.glob(os.path.join(tasks_dir, '*.jsonl'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    if stores:
+        from task_store import TaskStore
+        for store_dir in stores:
+            store = TaskStore(store_dir)
+            for _, result in store.items():
+                yield result
+            store.close()
+
+
+def collect_pages(tasks_dir: str = TASKS_DIR, stores: List[str] = None) -> Dict[str, str]:
+    """URL -> markdown, one result per URL (prune preferred, then longest markdown)"""
+    best: Dict[str, Tuple] = {}
+    for result in _iter_results(tasks_dir, stores or []):
+        if not isinstance(result, dict) or not result.get("success") or not result.get("markdown"):
+            continue
+        rank = (FILTER_PRIORITY.get(result.get("filter"), 2), -len(result["markdown"]))
+        url = result.get("url")
+        if url and (url not in best or rank < best[url][0]):
+            best[url] = (rank, result["markdown"])
+    return {url: markdown for url, (_, markdown) in best.items()}
+
+
+def build_index(pages: Dict[str, str], index_dir: str = INDEX_DIR) -> Dict:
+    """Writes passage-level inverted index: postings as flat arrays grouped by term"""
+    urls = list(pages)
+    passage_page, passage_length, texts = [], [], []
+    postings: Dict[str, Dict[int, int]] = {}
+
+    for page_id, url in enumerate(urls):
+        for text in chunk_markdown(pages[url]):
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            passage_id = len(texts)
+            texts.append(text)
+            passage_page.append(page_id)
+            passage_length.append(len(tokens))
+            for token in tokens:
+                counts = postings.setdefault(token, {})
+                counts[passage_id] = counts.get(passage_id, 0) + 1
+
+    os.makedirs(index_dir, exist_ok=True)
+    vocab = {}
+    ids, tfs = [], []
+    for term in sorted(postings):
+        counts = postings[term]
+        vocab[term] = [len(ids), len(counts)]
+        ids.extend(counts.keys())
+        tfs.extend(counts.values())
+
+    np.save(os.path.join(index_dir, 'postings_ids.npy'), np.array(ids, dtype=np.uint32))
+    np.save(os.path.join(index_dir, 'postings_tf.npy'), np.array(tfs, dtype=np.float32))
+    np.save(os.path.join(index_dir, 'passage_page.npy'), np.array(passage_page, dtype=np.uint32))
+    np.save(os.path.join(index_dir, 'passage_length.npy'), np.array(passage_length, dtype=np.float32))
+
+    offsets = [0]
+    with open(os.path.join(index_dir, 'passages.txt'), 'wb') as f:
+        for text in texts:
+            data = text.encode('utf-8')
+            f.write(data)
+            offsets.append(offsets[-1] + len(data))
+    np.save(os.path.join(index_dir, 'passage_offsets.npy'), np.array(offsets, dtype=np.uint64))
+
+    meta = {
+        "pages": urls,
+        "passages": len(texts),
+        "avg_length": float(np.mean(passage_length)) if passage_length else 0.0,
+        "vocab": vocab
+    }
+    with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+
+class SearchIndex:
+    """Read side of the index. Arrays are memory-mapped, so opening is cheap and only
+    postings of query terms are paged in."""
+
+    def __init__(self, index_dir: str = INDEX_DIR, k1: float = K1, b: float = B):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.pages: List[str] = meta["pages"]
+        self.vocab: Dict[str, List[int]] = meta["vocab"]
+        self.n_passages = meta["passages"]
+        self.avg_length = meta["avg_length"] or 1.0
+        self.k1 = k1
+        self.b = b
+
+        def load(name):
+            path = os.path.join(index_dir, f'{name}.npy')
+            try:
+                return np.load(path, mmap_mode='r')
+            except ValueError:
+                return np.load(path)  # empty arrays cannot be memory-mapped
+
+        self.postings_ids = load('postings_ids')
+        self.postings_tf = load('postings_tf')
+        self.passage_page = load('passage_page')
+        self.passage_length = load('passage_length')
+        self.passage_offsets = load('passage_offsets')
+        self._texts = open(os.path.join(index_dir, 'passages.txt'), 'rb')
+
+    def passage(self, passage_id: int) -> str:
+        start, end = int(self.passage_offsets[passage_id]), int(self.passage_offsets[passage_id + 1])
+        self._texts.seek(start)
+        return self._texts.read(end - start).decode('utf-8')
+
+    def score_passages(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (passage ids, BM25 scores) of passages containing any query term"""
+        ids, scores = [], []
+        for term in set(tokenize(query)):
+            if term not in self.vocab:
+                continue
+            start, df = self.vocab[term]
+            passage_ids = np.asarray(self.postings_ids[start:start + df], dtype=np.intp)
+            tf = self.postings_tf[start:start + df]
+            idf = np.log1p((self.n_passages - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * self.passage_length[passage_ids] / self.avg_length)
+            ids.append(passage_ids)
+            scores.append(idf * tf * (self.k1 + 1.0) / (tf + norm))
+        if not ids:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.float32)
+
+        # Sum term scores per passage touching only postings, not all passages
+        unique_ids, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        return unique_ids, np.bincount(inverse, weights=np.concatenate(scores))
+
+    def search(self, query: str, top: int = DEFAULT_TOP, passages: int = PASSAGES_PER_PAGE) -> List[Dict]:
+        """Ranked pages (score of best passage) with their best matching passages"""
+        passage_ids, scores = self.score_passages(query)
+        if not len(passage_ids):
+            return []
+
+        order = np.argsort(-scores, kind='stable')
+        results: Dict[int, Dict] = {}
+        for i in order:
+            page_id = int(self.passage_page[passage_ids[i]])
+            page = results.get(page_id)
+            if page is None:
+                if len(results) >= top:
+                    continue
+                page = results[page_id] = {"url": self.pages[page_id], "score": round(float(scores[i]), 4),
+                                           "passages": []}
+            if len(page["passages"]) < passages:
+                page["passages"].append(self.passage(int(passage_ids[i])))
+        return list(results.values())
+
+    def close(self):
+        self._texts.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query a local BM25 index of crawled pages.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Index markdown of all results in tasks/")
+    build_parser.add_argument("--tasks", type=str, default=TASKS_DIR,
+                              help="Directory with *.json / *.jsonl results (default: tasks/)")
+    build_parser.add_argument("--store", type=str, action="append", metavar="DIR",
+                              help="Also index a task store (fetch_website.py --store), repeatable")
+    build_parser.add_argument("--index", type=str, default=INDEX_DIR, help="Index directory (default: tasks/.index)")
+
+    query_parser = subparsers.add_parser("query", help="Rank pages and passages for keyword(s)")
+    query_parser.add_argument("keywords", type=str, nargs="*", help="Keyword(s) to look up")
+    query_parser.add_argument("--keywords-file", type=str, metavar="FILE", help="Keywords, one per line")
+    query_parser.add_argument("--index", type=str, default=INDEX_DIR, help="Index directory (default: tasks/.index)")
+    query_parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Pages per keyword (default: {DEFAULT_TOP})")
+    query_parser.add_argument("--passages", type=int, default=PASSAGES_PER_PAGE,
+                              help=f"Passages per page (default: {PASSAGES_PER_PAGE})")
+    query_parser.add_argument("--jsonl", action="store_true", help="Print one JSON line per keyword")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        pages = collect_pages(args.tasks, args.store)
+        if not pages:
+            print(f"❌ No successful results with markdown in {args.tasks}")
+            sys.exit(1)
+        meta = build_index(pages, args.index)
+        print(f"✅ Indexed {len(meta['pages'])} pages, {meta['passages']} passages, "
+              f"{len(meta['vocab'])} terms into {args.index}")
+        return
+
+    keywords = list(args.keywords)
+    if args.keywords_file:
+        with open(args.keywords_file, 'r', encoding='utf-8') as f:
+            keywords += [line.strip() for line in f if line.strip()]
+    if not keywords:
+        parser.error("query requires keyword(s) or --keywords-file")
+    if not os.path.exists(os.path.join(args.index, 'meta.json')):
+        print(f"❌ No index in {args.index} - run: python3 {sys.argv[0]} build")
+        sys.exit(1)
+
+    index = SearchIndex(args.index)
+    for keyword in keywords:
+        results = index.search(keyword, args.top, args.passages)
+        if args.jsonl:
+            print(json.dumps({"keyword": keyword, "results": results}, ensure_ascii=False))
+            continue
+        print(f"\n🔎 {keyword}: {len(results)} pages")
+        for rank, page in enumerate(results, 1):
+            print(f"  {rank}. {page['url']} ({page['score']})")
+            for passage in page["passages"]:
+                print(f"     - {passage[:160]}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shortening engine - ranked, ellipsis-free shorter variants of ad texts, memoized per (text, limit)
+"""
+import re
+import sys
+from functools import lru_cache
+from typing import Callable, List, Tuple
+
+from text_width import fit_width, is_narrow, text_width
+
+CACHE_SIZE = 1 << 16        # (text, limit) pairs kept per process
+
+# Words dropped without changing the offer (PL / EN / DE)
+FILLER_WORDS = frozenset({
+    "bardzo", "naprawdę", "właśnie", "teraz", "już", "nawet", "także", "również",
+    "very", "really", "just", "now", "truly", "simply", "actually",
+    "sehr", "wirklich", "jetzt", "einfach", "schon", "nur", "auch",
+})
+# Articles - dropped after fillers, reads like a headline
+STOPWORDS = frozenset({"the", "a", "an"})
+# Words that must not end a shortened text ("Najlepsze buty do biegania w")
+DANGLING_WORDS = frozenset({
+    "i", "w", "we", "z", "ze", "do", "na", "o", "od", "dla", "po", "za", "przy", "oraz", "lub", "czy", "a", "ale",
+    "bez", "pod", "nad", "u", "przez", "and", "or", "for", "with", "to", "of", "in", "on", "at", "by", "from",
+    "the", "an", "your", "our", "und", "oder", "für", "mit", "zu", "von", "im", "am", "auf", "bei", "der",
+    "die", "das", "den", "dem", "ein", "eine",
+})
+ABBREVIATIONS = {
+    "złotych": "zł", "złote": "zł", "złoty": "zł", "procent": "%", "procentów": "%", "numer": "nr",
+    "ulica": "ul.", "godzin": "godz.", "godziny": "godz.", "minut": "min", "sztuk": "szt.", "tysięcy": "tys.",
+    "milionów": "mln", "około": "ok.", "telefon": "tel.", "kilogramów": "kg", "centymetrów": "cm",
+    "and": "&", "percent": "%", "hours": "hrs", "minutes": "min", "number": "no.", "information": "info",
+    "und": "&", "prozent": "%", "stunden": "Std.", "minuten": "Min.", "inklusive": "inkl.",
+}
+# Abbreviated forms dangle like the words they replace ("... trail &")
+DANGLING_WORDS |= {ABBREVIATIONS[word] for word in DANGLING_WORDS if word in ABBREVIATIONS} | {"+"}
+
+PUNCT = ".,!?:;"
+COMPACTABLE = frozenset(PUNCT + "%-–—|…")
+# A punctuation run with the spaces before and inside it (". . .", "!!", " ,"), or a space before "%"
+PUNCT_RUN_RE = re.compile(r"\s*([.,!?:;…](?:\s*[.,!?:;…])*)|\s+%")
+SEPARATOR_RE = re.compile(r"\s+[-–—|]\s+")
+SUBWORD_RE = re.compile(r"([-_/])")
+TRAILING_RE = re.compile(r"[\s,;:\-–—|/_]+$")
+
+# Rank tiers: whole text kept > abbreviated > fillers dropped > articles dropped > trailing words dropped > hard cut
+TIER_COMPACT, TIER_ABBREVIATED, TIER_FILLERS, TIER_STOPWORDS, TIER_TRUNCATED, TIER_CUT = range(6)
+
+
+def _punct_run(match) -> str:
+    """One mark for a punctuation run: its first non-dot mark, a lone period, or nothing for an
+    ellipsis and for leading punctuation - an ellipsis is a pause, not a sentence end"""
+    run = match.group(1)
+    if run is None:
+        return "%"
+    if match.start() == 0:
+        return ""
+    marks = run.replace(" ", "")
+    mark = marks.strip(".…")[:1] or ("." if marks == "." else "")
+    if mark:
+        return mark
+    # Ellipsis dropped - keep the words it separated apart ("Buty…najlepsze")
+    rest = match.string[match.end():match.end() + 1]
+    return " " if rest and not rest.isspace() else ""
+
+
+def compact(text: str) -> str:
+    """Collapses whitespace, punctuation runs and spaced separators; drops ellipses, leading
+    punctuation and trailing period"""
+    text = " ".join(text.split())
+    if not COMPACTABLE.isdisjoint(text):
+        text = PUNCT_RUN_RE.sub(_punct_run, SEPARATOR_RE.sub(", ", text))
+    return text.strip().rstrip(" .")
+
+
+def reduce_words(words: List[str], limit: int,
+                 measure: Callable[[str], int] = len) -> Tuple[List[str], List[str], List[str]]:
+    """One pass over words: (abbreviated, + fillers dropped, + articles dropped); punctuation of a
+    dropped word moves to the previous one. Stops once even the shortest variant exceeds limit."""
+    abbreviated, no_fillers, no_stopwords = [], [], []
+    length = -1     # of no_stopwords joined with spaces
+    for word in words:
+        if length > limit:
+            break
+        core = word.rstrip(PUNCT)
+        punct = word[len(core):]
+        key = core.lower()
+        short = ABBREVIATIONS.get(key)
+        if short is not None:
+            if short == "%" and abbreviated:
+                # "20 procent" -> "20%"
+                for variant in (abbreviated, no_fillers, no_stopwords):
+                    if variant:
+                        variant[-1] += "%" + punct
+                length += 1 + measure(punct)
+                continue
+            if core[:1].isupper() and short[:1].isalpha():
+                short = short[:1].upper() + short[1:]
+            word = short + punct
+        abbreviated.append(word)
+        if key in FILLER_WORDS:
+            if punct and no_fillers:
+                no_fillers[-1] += punct
+        else:
+            no_fillers.append(word)
+            if key not in STOPWORDS:
+                no_stopwords.append(word)
+                length += 1 + measure(word)
+                continue
+        if punct and no_stopwords:
+            no_stopwords[-1] += punct
+            length += measure(punct)
+    return abbreviated, no_fillers or abbreviated, no_stopwords or abbreviated
+
+
+def _trim(text: str) -> str:
+    """Strips trailing separators and dangling prepositions / conjunctions"""
+    while True:
+        text = TRAILING_RE.sub("", text)
+        head, _, last = text.rpartition(" ")
+        if not head or last.rstrip(PUNCT).lower() not in DANGLING_WORDS:
+            return text
+        text = head
+
+
+def truncate_words(words: List[str], limit: int, measure: Callable[[str], int] = len) -> Tuple[str, int]:
+    """Longest word prefix within limit (single pass over running length) and number of words kept"""
+    length = -1
+    kept = 0
+    for word in words:
+        width = measure(word)
+        if length + 1 + width > limit:
+            break
+        length += 1 + width
+        kept += 1
+    text = _trim(" ".join(words[:kept]))
+    return text, len(text.split())
+
+
+def truncate_subwords(word: str, limit: int, measure: Callable[[str], int] = len) -> str:
+    """Cuts a single long word (URL path like buty-do-biegania) at its - _ / separators"""
+    parts = SUBWORD_RE.split(word)
+    length = 0
+    kept = 0
+    for part in parts:
+        width = measure(part)
+        if length + width > limit:
+            break
+        length += width
+        kept += 1
+    text = "".join(parts[:kept])
+    while True:
+        text = TRAILING_RE.sub("", text)
+        head, sep, last = max((text.rpartition(s) for s in "-_/"), key=lambda p: len(p[0]))
+        if not sep or last.lower() not in DANGLING_WORDS:
+            return text
+        text = head
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def shortening_candidates(text: str, limit: int) -> Tuple[str, ...]:
+    """Ranked shorter variants of text within limit, best first; never adds ellipses"""
+    if limit <= 0:
+        return ()
+    measure = len if is_narrow(text) else text_width
+    ranked = []
+    compacted = compact(text)
+    words = compacted.split()
+    abbreviated, no_fillers, no_stopwords = reduce_words(words, limit, measure)
+
+    # Whole text, progressively reduced
+    for tier, variant in ((TIER_COMPACT, words), (TIER_ABBREVIATED, abbreviated),
+                          (TIER_FILLERS, no_fillers), (TIER_STOPWORDS, no_stopwords)):
+        candidate = " ".join(variant)
+        if candidate and measure(candidate) <= limit:
+            ranked.append((tier, 0, -measure(candidate), candidate))
+
+    # Trailing words dropped - the larger the share of the variant kept, the better
+    for variant in (words, no_stopwords):
+        candidate, kept = truncate_words(variant, limit, measure)
+        if candidate:
+            ranked.append((TIER_TRUNCATED, -kept / len(variant), -measure(candidate), candidate))
+
+    # First word alone over the limit: cut at its separators, hard cut as last resort
+    if not ranked and words:
+        candidate = truncate_subwords(words[0], limit, measure)
+        if candidate:
+            ranked.append((TIER_TRUNCATED, 0, -measure(candidate), candidate))
+        else:
+            ranked.append((TIER_CUT, 0, 0, fit_width(compacted, limit).rstrip()))
+
+    seen = set()
+    result = []
+    for _, _, _, candidate in sorted(ranked):
+        if text[:1].isupper() and candidate[:1].islower():
+            candidate = candidate[:1].upper() + candidate[1:]
+        if candidate and candidate not in seen and candidate != text:
+            seen.add(candidate)
+            result.append(candidate)
+    return tuple(result)
+
+
+def suggest_shortening(text: str, max_length: int) -> str:
+    """Best shortened version of text within max_length (text itself when it fits)"""
+    if text_width(text) <= max_length:
+        return text
+    candidates = shortening_candidates(text, max_length)
+    return candidates[0] if candidates else ""
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: shortening.py LIMIT \"text1\" \"text2\" ...")
+        sys.exit(0)
+    limit = int(sys.argv[1])
+    for text in sys.argv[2:]:
+        print(f'"{text}" - {text_width(text)}/{limit}')
+        for rank, candidate in enumerate(shortening_candidates(text, limit), 1):
+            print(f'  {rank}. "{candidate}" - {text_width(candidate)}')
+
+
+if __name__ == "__main__":
+    main()
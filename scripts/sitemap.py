@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sitemap reader - yields page URLs from sitemap.xml and sitemap indexes
+"""
+import io
+import gzip
+import re
+import urllib.request
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Optional
+from urllib.parse import urljoin, urlparse
+
+FETCH_TIMEOUT = 30
+MAX_DEPTH = 3  # nested sitemap indexes followed
+
+
+def fetch_bytes(url: str, timeout: float = FETCH_TIMEOUT) -> bytes:
+    """Downloads sitemap, transparently un-gzipping .xml.gz files"""
+    request = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        data = response.read()
+    if data[:2] == b'\x1f\x8b':
+        data = gzip.decompress(data)
+    return data
+
+
+def sitemap_url_for(url: str) -> str:
+    """Returns sitemap URL - given URL if it points to XML, otherwise /sitemap.xml of its host"""
+    if re.search(r'\.xml(\.gz)?$', urlparse(url).path):
+        return url
+    return urljoin(url, '/sitemap.xml')
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_sitemap(url: str, depth: int = 0, seen: Optional[set] = None) -> Iterator[str]:
+    """Yields page URLs, following <sitemapindex> entries up to MAX_DEPTH levels"""
+    seen = set() if seen is None else seen
+    if url in seen or depth > MAX_DEPTH:
+        return
+    seen.add(url)
+
+    try:
+        data = fetch_bytes(url)
+    except Exception as e:
+        print(f"⚠️ Could not read sitemap {url}: {e}")
+        return
+
+    children = []
+    is_index = False
+    try:
+        for event, element in ET.iterparse(io.BytesIO(data), events=("start", "end")):
+            tag = _local(element.tag)
+            if event == "start":
+                if tag == "sitemapindex":
+                    is_index = True
+                continue
+            if tag == "loc" and element.text:
+                loc = element.text.strip()
+                if is_index:
+                    children.append(loc)
+                else:
+                    yield loc
+            elif tag in ("url", "sitemap"):
+                element.clear()
+    except ET.ParseError as e:
+        print(f"⚠️ Invalid sitemap XML {url}: {e}")
+
+    for child in children:
+        yield from iter_sitemap(child, depth + 1, seen)
+
+
+def filter_urls(urls: Iterator[str], include: List[str] = None, exclude: List[str] = None,
+                limit: int = None) -> Iterator[str]:
+    """Yields unique URLs matching any include regex and no exclude regex"""
+    include_re = [re.compile(p) for p in include or []]
+    exclude_re = [re.compile(p) for p in exclude or []]
+    seen = set()
+    for url in urls:
+        if url in seen:
+            continue
+        if include_re and not any(r.search(url) for r in include_re):
+            continue
+        if any(r.search(url) for r in exclude_re):
+            continue
+        seen.add(url)
+        yield url
+        if limit and len(seen) >= limit:
+            return
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Structured data extraction - title, meta tags, Open Graph, JSON-LD products and headings in one HTML pass
+"""
+import json
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+HEADING_TAGS = ("h1", "h2", "h3")
+MAX_HEADINGS = 30               # per level
+JSON_LD_TYPE = "application/ld+json"
+PRODUCT_TYPES = {"Product", "ProductGroup", "IndividualProduct"}
+ORGANIZATION_TYPES = {"Organization", "Corporation", "LocalBusiness", "OnlineStore", "Store", "Brand"}
+
+
+class _PageParser(HTMLParser):
+    """Collects tags of interest while the document is parsed once"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.meta: Dict[str, str] = {}
+        self.open_graph: Dict[str, str] = {}
+        self.canonical = None
+        self.lang = None
+        self.headings: Dict[str, List[str]] = {tag: [] for tag in HEADING_TAGS}
+        self.json_ld: List[str] = []
+        self._capture = None    # "title", heading tag or "json_ld"
+        self._buffer: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k.lower(): v or "" for k, v in attrs}
+        if tag == "html" and attrs.get("lang"):
+            self.lang = attrs["lang"]
+        elif tag == "meta":
+            name = (attrs.get("name") or "").lower()
+            prop = (attrs.get("property") or "").lower()
+            content = attrs.get("content", "").strip()
+            if prop.startswith("og:") or prop.startswith("product:"):
+                self.open_graph.setdefault(prop, content)
+            elif name:
+                self.meta.setdefault(name, content)
+        elif tag == "link" and "canonical" in attrs.get("rel", "").lower().split():
+            self.canonical = attrs.get("href")
+        elif tag == "title" and not self.title:
+            self._start("title")
+        elif tag in HEADING_TAGS:
+            self._start(tag)
+        elif tag == "script" and attrs.get("type", "").lower() == JSON_LD_TYPE:
+            self._start("json_ld")
+
+    def _start(self, capture):
+        self._capture = capture
+        self._buffer = []
+
+    def handle_data(self, data):
+        if self._capture:
+            self._buffer.append(data)
+
+    def handle_endtag(self, tag):
+        capture = self._capture
+        if capture is None:
+            return
+        if capture == "json_ld" and tag == "script":
+            self.json_ld.append("".join(self._buffer))
+        elif capture == "title" and tag == "title":
+            self.title = " ".join("".join(self._buffer).split())
+        elif capture == tag and tag in HEADING_TAGS:
+            text = " ".join("".join(self._buffer).split())
+            if text and len(self.headings[tag]) < MAX_HEADINGS:
+                self.headings[tag].append(text)
+        else:
+            return
+        self._capture = None
+
+
+def _types(node: Dict) -> set:
+    value = node.get("@type", [])
+    return set(value if isinstance(value, list) else [value])
+
+
+def _nodes(data) -> List[Dict]:
+    """Flattens JSON-LD documents, lists and @graph into a list of typed nodes"""
+    if isinstance(data, list):
+        return [node for item in data for node in _nodes(item)]
+    if not isinstance(data, dict):
+        return []
+    nodes = [data] if "@type" in data else []
+    return nodes + _nodes(data.get("@graph", []))
+
+
+def _name(value) -> Optional[str]:
+    if isinstance(value, dict):
+        return value.get("name")
+    if isinstance(value, list):
+        return _name(value[0]) if value else None
+    return value
+
+
+def _offer(offers) -> Dict:
+    """Price fields of the first Offer or AggregateOffer"""
+    if isinstance(offers, list):
+        offers = offers[0] if offers else {}
+    if not isinstance(offers, dict):
+        return {}
+    spec = offers.get("priceSpecification")
+    if isinstance(spec, list):
+        spec = spec[0] if spec else None
+    spec = spec if isinstance(spec, dict) else {}
+    availability = offers.get("availability")
+    offer = {
+        "price": offers.get("price", spec.get("price")),
+        "low_price": offers.get("lowPrice"),
+        "high_price": offers.get("highPrice"),
+        "currency": offers.get("priceCurrency", spec.get("priceCurrency")),
+        "availability": availability.rsplit("/", 1)[-1] if isinstance(availability, str) else None,
+    }
+    return {key: value for key, value in offer.items() if value not in (None, "")}
+
+
+def _product(node: Dict) -> Dict:
+    rating = node.get("aggregateRating") if isinstance(node.get("aggregateRating"), dict) else {}
+    product = {
+        "name": node.get("name"),
+        "brand": _name(node.get("brand")),
+        "sku": node.get("sku"),
+        "gtin": node.get("gtin13") or node.get("gtin") or node.get("gtin8") or node.get("gtin14"),
+        "description": node.get("description"),
+        "rating": rating.get("ratingValue"),
+        "review_count": rating.get("reviewCount") or rating.get("ratingCount"),
+    }
+    product.update(_offer(node.get("offers")))
+    return {key: value for key, value in product.items() if value not in (None, "")}
+
+
+def _organization(node: Dict) -> Dict:
+    organization = {
+        "name": node.get("name"),
+        "url": node.get("url"),
+        "logo": node.get("logo", {}).get("url") if isinstance(node.get("logo"), dict) else node.get("logo"),
+        "telephone": node.get("telephone"),
+    }
+    return {key: value for key, value in organization.items() if value not in (None, "")}
+
+
+def extract_structured(html: str) -> Dict:
+    """Returns structured page data: title, description, Open Graph, JSON-LD products/organization, headings"""
+    parser = _PageParser()
+    try:
+        parser.feed(html or "")
+        parser.close()
+    except Exception:
+        pass  # keep whatever was collected before malformed markup
+
+    products, organizations = [], []
+    for raw in parser.json_ld:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        for node in _nodes(data):
+            types = _types(node)
+            if types & PRODUCT_TYPES:
+                products.append(_product(node))
+            elif types & ORGANIZATION_TYPES:
+                organizations.append(_organization(node))
+
+    description = parser.meta.get("description", "")
+    return {
+        "title": parser.title,
+        "title_length": len(parser.title),
+        "description": description,
+        "description_length": len(description),
+        "canonical": parser.canonical,
+        "lang": parser.lang,
+        "open_graph": parser.open_graph,
+        "products": products,
+        "organization": organizations[0] if organizations else None,
+        "headings": parser.headings,
+    }
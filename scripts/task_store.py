@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Task store - crawl results appended as compressed records to segment files with a URL index
+"""
+import os
+import sys
+import json
+import zlib
+import argparse
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024   # new segment file is started after this size
+INDEX_FILE = "index.jsonl"
+COMPRESS_LEVEL = 6
+
+
+def record_key(url: str, mode: str, query: Optional[str] = None) -> str:
+    """Index key for URL + filter mode + BM25 query"""
+    return json.dumps([url, mode, query or None], ensure_ascii=False)
+
+
+class TaskStore:
+    """Append-only store of crawl results.
+
+    Each result is one zlib-compressed JSON record in a segment file. The index
+    (one JSON line per write, last line wins) maps URL + filter + query to the
+    record position, so reads are one seek and listing never scans a directory
+    of per-page files.
+    """
+
+    def __init__(self, path: str, segment_max_bytes: int = SEGMENT_MAX_BYTES):
+        self.path = path
+        self.segment_max_bytes = segment_max_bytes
+        self.index: Dict[str, Dict] = {}
+        self._segment = 0
+        self._writer = None
+        self._index_file = None
+        os.makedirs(path, exist_ok=True)
+        self._load_index()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"segment-{segment:05d}.seg")
+
+    def _load_index(self):
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # last line of an interrupted write
+                self.index[entry["key"]] = entry
+                self._segment = max(self._segment, entry["segment"])
+
+    def _open_writer(self, size: int):
+        if self._writer is None or self._writer.tell() + size > self.segment_max_bytes:
+            if self._writer is not None:
+                self._writer.close()
+                self._segment += 1
+            elif os.path.exists(self._segment_path(self._segment)) and \
+                    os.path.getsize(self._segment_path(self._segment)) + size > self.segment_max_bytes:
+                self._segment += 1
+            self._writer = open(self._segment_path(self._segment), 'ab')
+        if self._index_file is None:
+            self._index_file = open(os.path.join(self.path, INDEX_FILE), 'a', encoding='utf-8')
+
+    def put(self, result: Dict, keyword: Optional[str] = None) -> str:
+        """Appends result and returns its key. keyword is kept for export file names."""
+        key = record_key(result["url"], result["filter"], result.get("query"))
+        data = zlib.compress(json.dumps(result, ensure_ascii=False).encode('utf-8'), COMPRESS_LEVEL)
+        self._open_writer(len(data))
+        offset = self._writer.tell()
+        self._writer.write(data)
+        self._writer.flush()
+
+        entry = {
+            "key": key, "url": result["url"], "filter": result["filter"], "query": result.get("query"),
+            "keyword": keyword, "success": result.get("success"),
+            "segment": self._segment, "offset": offset, "length": len(data)
+        }
+        # Index line is written after the record, so an index entry always points to complete data
+        self._index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._index_file.flush()
+        self.index[key] = entry
+        return key
+
+    def read(self, entry: Dict) -> Dict:
+        with open(self._segment_path(entry["segment"]), 'rb') as f:
+            f.seek(entry["offset"])
+            return json.loads(zlib.decompress(f.read(entry["length"])).decode('utf-8'))
+
+    def get(self, url: str, mode: str = "prune", query: Optional[str] = None) -> Optional[Dict]:
+        """Returns stored result or None"""
+        entry = self.index.get(record_key(url, mode, query))
+        return self.read(entry) if entry else None
+
+    def entries(self, url_prefix: str = None) -> Iterator[Dict]:
+        """Index entries (url, filter, query, keyword, success), from the index only"""
+        for entry in self.index.values():
+            if url_prefix is None or entry["url"].startswith(url_prefix):
+                yield entry
+
+    def items(self, url_prefix: str = None) -> Iterator[Tuple[Dict, Dict]]:
+        """(index entry, result) pairs, read segment by segment in file order"""
+        for entry in sorted(self.entries(url_prefix), key=lambda e: (e["segment"], e["offset"])):
+            yield entry, self.read(entry)
+
+    def export(self, path_for: Callable[[str, Optional[str]], str], url_prefix: str = None) -> int:
+        """Writes every result as a pretty-printed JSON file at path_for(url, keyword); returns count"""
+        count = 0
+        for entry, result in self.items(url_prefix):
+            filepath = path_for(entry["url"], entry.get("keyword"))
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=4)
+            count += 1
+        return count
+
+    def done_urls(self) -> set:
+        """URLs with a successful stored result, from the index only"""
+        return {entry["url"] for entry in self.index.values() if entry["success"]}
+
+    def compact(self) -> int:
+        """Rewrites live records into new segments, dropping overwritten ones; returns bytes freed.
+
+        New segments are numbered after the existing ones and the new index is written to a
+        temporary file swapped in with os.replace; old segments are deleted only after the swap,
+        so an interrupted compaction leaves the store readable as it was.
+        """
+        old_files = sorted(e.path for e in os.scandir(self.path) if e.name.endswith(".seg"))
+        before = sum(os.path.getsize(p) for p in old_files)
+        live = sorted(self.index.values(), key=lambda e: (e["segment"], e["offset"]))
+        self.close()
+
+        # Orphans of an interrupted compaction count too - their names are never reused
+        self._segment = max((int(os.path.basename(p)[8:-4]) for p in old_files), default=-1) + 1
+        index_path = os.path.join(self.path, INDEX_FILE)
+        self._index_file = open(f"{index_path}.tmp", 'w', encoding='utf-8')
+        for entry in live:
+            self.put(self.read(entry), entry.get("keyword"))
+        for f in (self._writer, self._index_file):
+            if f is not None:
+                os.fsync(f.fileno())
+        self.close()
+
+        os.replace(f"{index_path}.tmp", index_path)
+        for path in old_files:
+            os.remove(path)
+
+        self.index = {}
+        self._segment = 0
+        self._load_index()
+        after = sum(os.path.getsize(e.path) for e in os.scandir(self.path) if e.name.endswith(".seg"))
+        return before - after
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def __len__(self):
+        return len(self.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and export a crawl task store.")
+    parser.add_argument("store", type=str, help="Task store directory (fetch_website.py --store)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List stored results (from the index only)")
+    list_parser.add_argument("--prefix", type=str, help="Only URLs starting with prefix")
+
+    get_parser = subparsers.add_parser("get", help="Print one stored result as JSON")
+    get_parser.add_argument("url", type=str)
+    get_parser.add_argument("--mode", type=str, choices=["prune", "bm25"], default="prune")
+    get_parser.add_argument("--query", type=str, help="BM25 query")
+
+    export_parser = subparsers.add_parser("export", help="Write results as tasks/*.json files")
+    export_parser.add_argument("--out", type=str, help="Output directory (default: tasks/)")
+    export_parser.add_argument("--prefix", type=str, help="Only URLs starting with prefix")
+
+    subparsers.add_parser("compact", help="Drop overwritten records from segment files")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.store):
+        print(f"❌ Task store not found: {args.store}")
+        sys.exit(1)
+    store = TaskStore(args.store)
+
+    if args.command == "list":
+        for entry in store.entries(args.prefix):
+            status = "✅" if entry["success"] else "❌"
+            query = f" [{entry['query'] or entry['keyword']}]" if entry["query"] or entry["keyword"] else ""
+            print(f"{status} {entry['filter']:5} {entry['url']}{query}")
+        print(f"\n{len(store)} results")
+    elif args.command == "get":
+        result = store.get(args.url, args.mode, args.query)
+        if result is None:
+            print(f"❌ No stored result for {args.url}")
+            sys.exit(1)
+        print(json.dumps(result, ensure_ascii=False, indent=4))
+    elif args.command == "export":
+        from fetch_website import output_path, OUTPUT_DIR
+        out_dir = args.out or OUTPUT_DIR
+        count = store.export(lambda url, keyword: output_path(url, keyword, out_dir), args.prefix)
+        print(f"✅ Exported {count} results to {out_dir}")
+    elif args.command == "compact":
+        freed = store.compact()
+        print(f"✅ Compacted store, {freed / 1024:.1f} KB freed")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
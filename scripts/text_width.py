@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text width - ad text length as Google counts it: CJK / full-width characters and emoji count 2,
+combining marks and joined emoji sequences do not add length
+"""
+import sys
+import unicodedata
+from typing import List, Tuple
+
+TABLE_SIZE = 0x20000        # planes 0-1 in the lookup table; planes 2-3 (CJK) are wide, the rest narrow
+ZERO_CATEGORIES = ("Mn", "Me", "Mc")
+ZERO_WIDTH = {0x200B, 0x200C, 0x200D, 0x200E, 0x200F, 0x2060, 0x2061, 0x2062, 0x2063, 0x2064, 0xFEFF}
+CONJOINING_JAMO = (0x1160, 0x11FF)      # Hangul vowels / finals join the preceding syllable
+SKIN_TONES = (0x1F3FB, 0x1F3FF)
+REGIONAL_INDICATORS = (0x1F1E6, 0x1F1FF)  # flag = pair of indicators
+# Viramas of Indic scripts join the next consonant into one conjunct
+LINKERS = {0x094D, 0x09CD, 0x0ACD, 0x0B4D, 0x0C4D, 0x0D4D}
+# Emoji that ZWJ joins into one sequence (approximation of Extended_Pictographic)
+PICTOGRAPHIC = ((0x00A9, 0x00A9), (0x00AE, 0x00AE), (0x203C, 0x203C), (0x2049, 0x2049), (0x2122, 0x2122),
+                (0x2139, 0x2139), (0x2194, 0x21AA), (0x231A, 0x23FF), (0x24C2, 0x24C2), (0x25AA, 0x25FE),
+                (0x2600, 0x27BF), (0x2934, 0x2935), (0x2B05, 0x2B55), (0x3030, 0x3030), (0x303D, 0x303D),
+                (0x3297, 0x3299), (0x1F000, 0x1FAFF))
+PICTOGRAPHIC_BIT = 4         # table flag next to the width (0-2) - ZWJ sequences join pictographic code points
+ZWJ = "\u200d"
+VS16 = "\ufe0f"             # emoji presentation selector
+# Everything below U+0300 (ASCII, Latin-1, Latin Extended A/B incl. Polish and German letters) has width 1
+NARROW_MAX = "\u02ff"
+
+_table = None
+
+
+def _build_table() -> bytearray:
+    """Width per code point of planes 0-1: 0 (joins previous character), 1 or 2, plus PICTOGRAPHIC_BIT"""
+    table = bytearray(b"\x01") * TABLE_SIZE
+    category = unicodedata.category
+    east_asian_width = unicodedata.east_asian_width
+    for cp in range(0x300, TABLE_SIZE):
+        ch = chr(cp)
+        cat = category(ch)
+        if cat in ZERO_CATEGORIES or cp in ZERO_WIDTH:
+            table[cp] = 0
+        elif cat != "Cn" and east_asian_width(ch) in "WF":
+            table[cp] = 2
+    table[CONJOINING_JAMO[0]:CONJOINING_JAMO[1] + 1] = bytes(CONJOINING_JAMO[1] - CONJOINING_JAMO[0] + 1)
+    table[SKIN_TONES[0]:SKIN_TONES[1] + 1] = bytes(SKIN_TONES[1] - SKIN_TONES[0] + 1)
+    table[REGIONAL_INDICATORS[0]:REGIONAL_INDICATORS[1] + 1] = b"\x02" * (REGIONAL_INDICATORS[1] - REGIONAL_INDICATORS[0] + 1)
+    for start, end in PICTOGRAPHIC:
+        for cp in range(start, end + 1):
+            table[cp] |= PICTOGRAPHIC_BIT
+    return table
+
+
+def _width_table() -> bytearray:
+    global _table
+    if _table is None:
+        _table = _build_table()
+    return _table
+
+
+def _astral_width(cp: int) -> int:
+    if 0x20000 <= cp <= 0x3FFFD:
+        return 2
+    if 0xE0000 <= cp <= 0xE0FFF:
+        return 0    # tags and variation selectors supplement
+    return 1
+
+
+def is_narrow(text: str) -> bool:
+    """True when every character has width 1, so len() is the ad length"""
+    return text.isascii() or max(text) <= NARROW_MAX
+
+
+def _clusters(text: str):
+    """Yields (index, width) of every grapheme cluster start; marks, skin tones, ZWJ-joined emoji,
+    virama conjuncts and the second indicator of a flag stay in the preceding cluster"""
+    table = _width_table()
+    emoji = False       # open cluster starts with an emoji
+    conjunct = False    # virama seen - next letter joins
+    zwj = False         # ZWJ after an emoji - next emoji joins
+    indicator = False   # odd regional indicator opened a flag
+    last = None
+    for i, ch in enumerate(text):
+        cp = ord(ch)
+        # PICTOGRAPHIC lies in planes 0-1, astral code points are never pictographic
+        entry = table[cp] if cp < TABLE_SIZE else _astral_width(cp)
+        width = entry & 3
+        pictographic = entry & PICTOGRAPHIC_BIT
+        if width == 0:
+            if ch == VS16 and last is not None and last[1] == 1:
+                last = (last[0], 2)
+            if cp in LINKERS:
+                conjunct = True
+            zwj = ch == ZWJ and emoji
+            continue
+        joins = (conjunct and unicodedata.category(ch) == "Lo") or (zwj and pictographic)
+        conjunct = zwj = False
+        if joins:
+            continue
+        if REGIONAL_INDICATORS[0] <= cp <= REGIONAL_INDICATORS[1]:
+            indicator = not indicator
+            if not indicator:
+                continue
+        else:
+            indicator = False
+        emoji = pictographic
+        if last is not None:
+            yield last
+        last = (i, width)
+    if last is not None:
+        yield last
+
+
+def text_width(text: str) -> int:
+    """Length of text as counted against Google Ads limits"""
+    if is_narrow(text):
+        return len(text)
+    return sum(width for _, width in _clusters(text))
+
+
+def fit_width(text: str, limit: int) -> str:
+    """Longest prefix of text within limit, cut between grapheme clusters"""
+    if is_narrow(text):
+        return text[:limit]
+    total = 0
+    for i, width in _clusters(text):
+        if total + width > limit:
+            return text[:i]
+        total += width
+    return text
+
+
+def wide_ranges() -> List[Tuple[int, int]]:
+    """Code point ranges of width 2 (unassigned gaps merged) - source of the JS lookup table"""
+    table = _width_table()
+    ranges = []
+    for cp in range(TABLE_SIZE):
+        if table[cp] & 3 != 2:
+            continue
+        if ranges and all(unicodedata.category(chr(c)) == "Cn" for c in range(ranges[-1][1] + 1, cp)):
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    ranges.append([0x20000, 0x3FFFD])
+    return [tuple(r) for r in ranges]
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--js":
+        # Character class for WIDE_RE in the n8n tools (n8n-agent/*.js)
+        print("".join(f"\\u{{{s:X}}}" if s == e else f"\\u{{{s:X}}}-\\u{{{e:X}}}" for s, e in wide_ranges()))
+        return
+    for text in sys.argv[1:]:
+        print(f'"{text}" - {text_width(text)}')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch ad validation - validates many ad sets in a process pool and streams results to JSONL
+"""
+import os
+import sys
+import json
+import glob
+import time
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from ad_rules import AdValidation, load_plan
+
+DEFAULT_CHUNK = 200         # ads per task sent to a worker
+DEFAULT_TOP = 10            # most common violations in summary
+# Files written next to inputs by the single-file validators
+SKIP_SUFFIXES = ('_validated.json', '_corrected.json')
+
+
+class Unreadable:
+    """Placeholder for an input that could not be read or parsed"""
+    __slots__ = ('error',)
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def resolve_rules(rules: str, ad_data: Dict) -> str:
+    """Rule spec for an ad - "auto" picks pmax for ads with long headlines, otherwise rsa"""
+    if rules != 'auto':
+        return rules
+    return 'pmax' if 'long_headlines' in ad_data else 'rsa'
+
+
+def violations(validation: AdValidation) -> List[Dict]:
+    """Every failed check of an ad as {"rule", ...details}"""
+    found = []
+    for field, check in validation.counts.items():
+        if not check.valid:
+            found.append({'rule': f"{field}.count", 'count': check.count, 'min': check.min, 'max': check.max})
+    for name, check in validation.rules.items():
+        if not check.valid:
+            found.append({'rule': name, 'found': len(check.matches)})
+    for field, checks in validation.texts.items():
+        for check in checks:
+            if not check.valid:
+                found.append({'rule': f"{field}.length", 'text': check.text, 'length': check.length,
+                              'limit': check.limit, 'suggestion': check.suggestion})
+            for violation in check.violations:
+                found.append({'rule': f"{field}.{violation.rule}", 'text': check.text, 'start': violation.start,
+                              'end': violation.end, 'match': violation.match})
+    return found
+
+
+def validate_ad(source: str, ad_data, rules: str = 'auto') -> Dict:
+    """Validation record of one ad set; never raises for bad input"""
+    if isinstance(ad_data, Unreadable):
+        return {'source': source, 'error': f"unreadable: {ad_data.error}", 'unreadable': True}
+    if not isinstance(ad_data, dict):
+        return {'source': source, 'error': 'ad set is not a JSON object'}
+    spec = resolve_rules(rules, ad_data)
+    try:
+        plan = load_plan(spec)
+    except (OSError, ValueError, KeyError) as e:
+        return {'source': source, 'error': f"invalid rule spec '{spec}': {e}"}
+    missing = [field for field in plan.required_fields if field not in ad_data]
+    if missing:
+        return {'source': source, 'rules': spec, 'error': f"missing required fields: {missing}"}
+    try:
+        validation = plan.validate(ad_data)
+    except (TypeError, AttributeError) as e:
+        return {'source': source, 'rules': spec, 'error': f"invalid ad set: {e}"}
+    return {
+        'source': source,
+        'rules': spec,
+        'campaign_name': ad_data.get('campaign_name', ''),
+        'all_valid': validation.all_valid,
+        'error_count': validation.error_count,
+        'violations': violations(validation),
+        'duplicates': [check.to_dict() for check in validation.duplicates]
+    }
+
+
+def validate_chunk(chunk: List[Tuple[str, object]], rules: str) -> List[Dict]:
+    """Worker task - rule plans are compiled once per worker process"""
+    return [validate_ad(source, ad_data, rules) for source, ad_data in chunk]
+
+
+def _read_json(path: str) -> Iterator[Tuple[str, object]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        yield path, Unreadable(str(e))
+        return
+    if isinstance(data, list):
+        for i, ad_data in enumerate(data):
+            yield f"{path}[{i}]", ad_data
+    else:
+        yield path, data
+
+
+def _read_jsonl(path: str) -> Iterator[Tuple[str, object]]:
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield f"{path}:{number}", json.loads(line)
+            except ValueError as e:
+                yield f"{path}:{number}", Unreadable(str(e))
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def iter_ads(inputs: List[str], exclude: Tuple[str, ...] = ()) -> Iterator[Tuple[str, object]]:
+    """(source, ad set) pairs from directories, glob patterns, .json and .jsonl files or - (stdin JSONL);
+    paths in exclude (e.g. the results file) are skipped"""
+    exclude = {os.path.realpath(path) for path in exclude}
+    for item in inputs:
+        if item == '-' or item.endswith('.jsonl'):
+            yield from _read_jsonl(item)
+            continue
+        if os.path.isdir(item):
+            paths = sorted(glob.glob(os.path.join(item, '*.json')) + glob.glob(os.path.join(item, '*.jsonl')))
+        elif os.path.exists(item):
+            paths = [item]
+        else:
+            paths = sorted(glob.glob(item, recursive=True))
+            if not paths:
+                yield item, Unreadable('no such file or pattern')
+        for path in paths:
+            if path.endswith(SKIP_SUFFIXES) or os.path.realpath(path) in exclude:
+                continue
+            yield from (_read_jsonl(path) if path.endswith('.jsonl') else _read_json(path))
+
+
+def _chunks(ads: Iterator[Tuple[str, object]], size: int) -> Iterator[List[Tuple[str, object]]]:
+    chunk = []
+    for item in ads:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(inputs: List[str], rules: str = 'auto', workers: int = 0,
+              chunk_size: int = DEFAULT_CHUNK, exclude: Tuple[str, ...] = ()) -> Iterator[Dict]:
+    """Yields validation records in input order; workers=1 validates in this process"""
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(iter_ads(inputs, exclude), chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from validate_chunk(chunk, rules)
+        return
+
+    # Bounded number of chunks in flight keeps memory flat on large JSONL streams
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(validate_chunk, chunk, rules))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+class BatchSummary:
+    """Aggregates pass rate and most common violations over streamed records"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total = 0
+        self.passed = 0
+        self.unreadable = 0
+        self.invalid = 0
+        self.with_duplicates = 0
+        self.by_rules = Counter()
+        self.by_violation = Counter()
+
+    def add(self, record: Dict) -> None:
+        self.total += 1
+        if record.get('unreadable'):
+            self.unreadable += 1
+            return
+        if 'rules' in record:
+            self.by_rules[record['rules']] += 1
+        if record.get('error'):
+            self.invalid += 1
+            return
+        if record['all_valid']:
+            self.passed += 1
+        if record['duplicates']:
+            self.with_duplicates += 1
+        for violation in record['violations']:
+            self.by_violation[violation['rule']] += 1
+
+    @property
+    def read(self) -> int:
+        return self.total - self.unreadable
+
+    @property
+    def validated(self) -> int:
+        return self.read - self.invalid
+
+    def to_dict(self, top: int = DEFAULT_TOP) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            'ads': self.total,
+            'validated': self.validated,
+            'passed': self.passed,
+            'failed': self.validated - self.passed,
+            'invalid': self.invalid,
+            'unreadable': self.unreadable,
+            'pass_rate': round(self.passed / self.read, 4) if self.read else 0.0,
+            'with_duplicates': self.with_duplicates,
+            'formats': dict(self.by_rules),
+            'top_violations': self.by_violation.most_common(top),
+            'seconds': round(elapsed, 2),
+            'ads_per_second': round(self.total / elapsed, 1) if elapsed else 0.0
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate many ad sets (RSA / PMAX) in parallel.")
+    parser.add_argument('inputs', type=str, nargs='+',
+                        help='Directories, glob patterns, .json / .jsonl files or - for JSONL on stdin')
+    parser.add_argument('--rules', type=str, default='auto',
+                        help='Rule spec for all ads, or auto: pmax when long_headlines present, else rsa (default: auto)')
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes (default: CPU count, 1 = no pool)')
+    parser.add_argument('--chunk', type=int, default=DEFAULT_CHUNK,
+                        help=f'Ads per worker task (default: {DEFAULT_CHUNK})')
+    parser.add_argument('-o', '--output', type=str, help='Write one JSON result per ad to this JSONL file')
+    parser.add_argument('--summary', type=str, metavar='FILE', help='Also write summary as JSON')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP,
+                        help=f'Most common violations shown (default: {DEFAULT_TOP})')
+    args = parser.parse_args()
+
+    summary = BatchSummary()
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        for record in run_batch(args.inputs, args.rules, args.workers, max(1, args.chunk),
+                                exclude=tuple(p for p in (args.output, args.summary) if p)):
+            summary.add(record)
+            if out:
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if record.get('error'):
+                print(f"⚠️ {record['source']}: {record['error']}")
+    finally:
+        if out:
+            out.close()
+
+    report = summary.to_dict(args.top)
+    print("\n" + "=" * 60)
+    print("📊 BATCH VALIDATION SUMMARY")
+    print("=" * 60)
+    print(f"Ad sets: {report['ads']} ({report['validated']} validated, {report['invalid']} invalid, "
+          f"{report['unreadable']} unreadable)")
+    print(f"✅ Passed: {report['passed']}  ❌ Failed: {report['failed']}  "
+          f"Pass rate: {report['pass_rate'] * 100:.1f}%")
+    if report['with_duplicates']:
+        print(f"🔁 With duplicate assets: {report['with_duplicates']} (see scripts/duplicates.py for cross-ad-group)")
+    if report['formats']:
+        print("Formats: " + ", ".join(f"{name} {count}" for name, count in report['formats'].items()))
+    if report['top_violations']:
+        print("\nMost common violations:")
+        for rule, count in report['top_violations']:
+            print(f"  {count:6}  {rule}")
+    print(f"\n⏱️ {report['seconds']}s ({report['ads_per_second']} ad sets/s)")
+    if args.output:
+        print(f"📁 Per-ad results saved in: {args.output}")
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    sys.exit(0 if report['validated'] and report['passed'] == report['ads'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from compact_markdown import compact_markdown, drop_boilerplate, is_boilerplate
+
+BAKERY = """# Sklep z ciastkami
+Ciasteczka owsiane pieczemy codziennie z mąki pełnoziarnistej.
+Ciasteczka owsiane z żurawiną - 12 zł za 250 g.
+Ta strona używa plików cookies. Korzystając z niej akceptujesz politykę prywatności.
+"""
+
+
+def test_page_within_budget_is_kept_whole():
+    compacted = compact_markdown(BAKERY, budget=2000, keyword="ciasteczka owsiane")
+    assert compacted["markdown"] == BAKERY.strip()
+
+
+def test_keyword_lines_survive_boilerplate_pass():
+    lines = BAKERY.strip().splitlines()
+    kept = drop_boilerplate(lines, "ciasteczka owsiane")
+    assert kept == lines[:3]
+
+
+def test_consent_banner_dropped_over_budget():
+    page = BAKERY + "\n".join(f"Opis produktu numer {i} z długim tekstem o składnikach." for i in range(60))
+    compacted = compact_markdown(page, budget=120, keyword="ciasteczka owsiane")["markdown"]
+    assert "Ciasteczka owsiane pieczemy codziennie" in compacted
+    assert "plików cookies" not in compacted
+
+
+def test_cookie_word_alone_is_not_boilerplate():
+    assert not is_boilerplate("Ciasteczka owsiane z żurawiną - 12 zł za 250 g.")
+    assert not is_boilerplate("# Polityka prywatności")
+    assert is_boilerplate("We use cookies. By browsing you accept our privacy policy.")
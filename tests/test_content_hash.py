@@ -0,0 +1,43 @@
+import json
+
+import content_hash
+from content_hash import HashLedger
+
+
+def _result(url, markdown):
+    return {"url": url, "filter": "prune", "success": True, "markdown": markdown}
+
+
+def test_ledgers_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "hashes.json")
+    first, second = HashLedger(path), HashLedger(path)
+    first.check(_result("https://example.com/a", "A"))
+    second.check(_result("https://example.com/b", "B"))
+
+    reloaded = HashLedger(path)
+    assert reloaded.check(_result("https://example.com/a", "A"))["changed"] is False
+    assert reloaded.check(_result("https://example.com/b", "B"))["changed"] is False
+    assert reloaded.check(_result("https://example.com/b", "B2"))["changed"] is True
+
+
+def test_ledger_is_read_only_when_checked(tmp_path):
+    path = tmp_path / "hashes.json"
+    HashLedger(str(path))
+    assert not path.exists()
+
+
+def test_log_is_compacted_on_load_and_reads_old_ledger(tmp_path, monkeypatch):
+    path = tmp_path / "hashes.json"
+    key = HashLedger.key("https://example.com/old", "prune")
+    path.write_text(json.dumps({key: {"hash": content_hash.content_hash("Old"), "changed_at": 0}}) + "\n")
+    monkeypatch.setattr(content_hash, "COMPACT_MIN_LINES", 5)
+
+    ledger = HashLedger(str(path))
+    for i in range(10):
+        ledger.check(_result("https://example.com/new", f"version {i}"))
+    assert len(path.read_text().splitlines()) == 11
+
+    reloaded = HashLedger(str(path))
+    assert reloaded.check(_result("https://example.com/old", "Old"))["changed"] is False
+    assert reloaded.check(_result("https://example.com/new", "version 9"))["changed"] is False
+    assert len(path.read_text().splitlines()) == 2
@@ -0,0 +1,45 @@
+import random
+
+import duplicates
+from duplicates import PAIRWISE_MAX, duplicate_pairs
+
+WORDS = ("tanie", "buty", "do", "biegania", "sklep", "online", "darmowa", "dostawa", "nowa", "kolekcja",
+         "promocja", "sportowe", "męskie", "damskie", "trekkingowe", "zimowe", "wyprzedaż", "rabat")
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    position = rng.randrange(len(word))
+    return word[:position] + word[position] + word[position:]
+
+
+def _corpus(size: int, seed: int = 7):
+    rng = random.Random(seed)
+    texts = []
+    while len(texts) < size:
+        words = rng.sample(WORDS, rng.randint(1, 5))
+        texts.append(" ".join(words))
+        roll = rng.random()
+        if roll < 0.3:
+            # Same text with one word misspelled
+            i = rng.randrange(len(words))
+            texts.append(" ".join(words[:i] + [_typo(words[i], rng)] + words[i + 1:]))
+        elif roll < 0.5:
+            # One word replaced or added
+            texts.append(" ".join(words[:-1] + rng.sample(WORDS, 1)))
+    return texts
+
+
+def test_typo_pair_found_among_many_texts():
+    fillers = [f"Filler {i}" for i in range(200)]
+    assert duplicate_pairs(["Tanie buty", "Tanie butty"]) == [(0, 1, 0.91)]
+    assert (0, 1, 0.91) in duplicate_pairs(["Tanie buty", "Tanie butty"] + fillers)
+
+
+def test_indexed_path_matches_pairwise(monkeypatch):
+    texts = _corpus(400)
+    assert len(set(texts)) > PAIRWISE_MAX
+    indexed = duplicate_pairs(texts)
+    monkeypatch.setattr(duplicates, "PAIRWISE_MAX", len(texts))
+    pairwise = duplicate_pairs(texts)
+    assert any(similarity < 1.0 and similarity >= duplicates.EDIT_THRESHOLD for _, _, similarity in pairwise)
+    assert indexed == pairwise
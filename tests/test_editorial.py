@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from editorial import POLICIES, compile_scanner
+
+ALL_RULES = tuple(POLICIES)
+
+
+def _rules(text, **options):
+    return [violation.rule for violation in compile_scanner(ALL_RULES, **options).scan(text)]
+
+
+@pytest.mark.parametrize("text", [
+    "ul. Długa 12/34 00-950 Warszawa",
+    "Rok 2024 2025 2026",
+    "Kod 12 345 678 90",
+    "EAN 5901234123457",
+    "Kod 1234567890123",
+    "Budżet 100.000.000 zł",
+    "Darmowa dostawa, zwrot 30 dni i 20% rabatu",
+])
+def test_numbers_without_phone_context_pass(text):
+    assert "phone_number" not in _rules(text)
+
+
+@pytest.mark.parametrize("text", [
+    "Infolinia +48 123 456 789",
+    "Zadzwoń: 22 123 45 67",
+    "tel. 600123456",
+    "Biuro (22) 123 45 67",
+    "Dzwoń 600-123-456",
+])
+def test_phone_numbers_flagged(text):
+    assert _rules(text) == ["phone_number"]
+
+
+def test_caps_threshold_and_acronyms():
+    assert _rules("Kup TERAZ") == ["excessive_caps"]
+    assert _rules("SEO w USA") == []
+    assert _rules("Program NASA", acronyms=("NASA",)) == []
+    assert _rules("Kup TERAZ", caps_min=6) == []
+
+
+def test_prefilter_never_skips_a_violation():
+    rng = random.Random(3)
+    alphabet = "aAbŻóÉ 0123456789+()-./!?,;:★|#🎉\t\xa0TelzadwońCALL"
+    scanner = compile_scanner(ALL_RULES, caps_min=2)
+    for _ in range(20000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        expected = [(m.lastgroup, m.start(), m.end()) for m in scanner.pattern.finditer(text)]
+        assert [(v.rule, v.start, v.end) for v in scanner.scan(text)] == expected, text
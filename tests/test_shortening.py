@@ -0,0 +1,32 @@
+import pytest
+
+from shortening import compact, shortening_candidates
+
+ELLIPSIS_TEXTS = [
+    "... Über buty & …",
+    ". . . Über buty und mehr . . . super Angebote",
+    "Tanie buty... teraz w promocji",
+    "Tanie buty … teraz w promocji",
+    "Buty…najlepsze w mieście",
+    "Nowa kolekcja. . . sprawdź!",
+]
+
+
+@pytest.mark.parametrize("text", ELLIPSIS_TEXTS)
+def test_candidates_have_no_ellipses_or_leading_punctuation(text):
+    for limit in range(5, 40):
+        for candidate in shortening_candidates(text, limit):
+            assert "..." not in candidate and "…" not in candidate
+            assert candidate[:1].isalnum()
+
+
+def test_mid_sentence_ellipsis_is_not_a_period():
+    assert compact("Tanie buty... teraz") == "Tanie buty teraz"
+    assert compact("Tanie buty . . . teraz") == "Tanie buty teraz"
+    assert compact("Buty…najlepsze") == "Buty najlepsze"
+
+
+def test_punctuation_runs_collapse_to_one_mark():
+    assert compact("Rabat 20 % !!! Kup teraz ?!") == "Rabat 20%! Kup teraz?"
+    assert compact("Buty - tanio | szybko.") == "Buty, tanio, szybko"
+    assert compact("Ceny od 9.99 zł. Dostawa 24h") == "Ceny od 9.99 zł. Dostawa 24h"
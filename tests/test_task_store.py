@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import task_store
+from task_store import TaskStore
+
+
+def _result(url, text):
+    return {"url": url, "filter": "prune", "success": True, "markdown": text}
+
+
+def _fill(path):
+    store = TaskStore(path, segment_max_bytes=200)
+    for round_ in range(3):
+        for i in range(5):
+            store.put(_result(f"https://example.com/{i}", f"page {i} round {round_} " * 10))
+    return store
+
+
+def test_compact_keeps_live_records(tmp_path):
+    store = _fill(str(tmp_path))
+    assert store.compact() > 0
+    store.put(_result("https://example.com/new", "after compaction"))
+    store.close()
+
+    reopened = TaskStore(str(tmp_path))
+    assert len(reopened) == 6
+    assert reopened.get("https://example.com/3")["markdown"].startswith("page 3 round 2")
+    assert reopened.get("https://example.com/new")["markdown"] == "after compaction"
+    assert not os.path.exists(os.path.join(str(tmp_path), "index.jsonl.tmp"))
+
+
+def test_interrupted_compact_leaves_store_readable(tmp_path, monkeypatch):
+    store = _fill(str(tmp_path))
+
+    def crash(src, dst):
+        raise OSError("power cut")
+
+    monkeypatch.setattr(task_store.os, "replace", crash)
+    with pytest.raises(OSError):
+        store.compact()
+    monkeypatch.undo()
+
+    reopened = TaskStore(str(tmp_path))
+    assert len(reopened) == 5
+    assert all(result["markdown"].startswith(f"page {i} round 2")
+               for i, (_, result) in enumerate(sorted(reopened.items(), key=lambda item: item[0]["url"])))
+    # A later compaction also clears the orphaned segments of the interrupted one
+    reopened.compact()
+    assert len(TaskStore(str(tmp_path))) == 5
+    assert reopened.done_urls() == {f"https://example.com/{i}" for i in range(5)}
@@ -0,0 +1,11 @@
+from validate_batch import BatchSummary, Unreadable, validate_ad
+
+
+def test_summary_counts_unreadable_apart_from_invalid():
+    summary = BatchSummary()
+    summary.add(validate_ad("a.jsonl:1", Unreadable("Expecting value")))
+    summary.add(validate_ad("a.jsonl:2", {"campaign_name": "no assets"}))
+    summary.add(validate_ad("a.jsonl:3", ["not", "an", "object"]))
+
+    report = summary.to_dict()
+    assert (report["ads"], report["unreadable"], report["invalid"], report["validated"]) == (3, 1, 2, 0)